@@ -1,6 +1,36 @@
+import functools
+import os
+import platform
 import sys
 from .core import Interpreter, ReturnSignal
 
+# Loops, calls, arithmetic and indexing: the paths a session spends its time in
+WARMUP_CODE = """
+fun square(n) {
+    return n * n
+}
+total = 0
+i = 0
+while (i < 3000) {
+    total = total + square(i) / 2
+    i = i + 1
+}
+values = [1, 2, 3]
+table = {"a": 1}
+for k in range(1000) {
+    total = total + values[1] + table["a"]
+}
+"""
+
+def warm_up():
+    """Runs code on a throwaway interpreter, so the first real input doesn't pay for
+    first-use setup. Under PyPy, or with MLSCRIPT_WARMUP set, that is WARMUP_CODE,
+    which also gives the JIT time to trace the evaluator; elsewhere a single statement."""
+    if platform.python_implementation() != 'PyPy' and not os.environ.get('MLSCRIPT_WARMUP'):
+        Interpreter().run("warm = 1 + 1")
+        return
+    Interpreter().run(WARMUP_CODE)
+
 def run_from_file(filepath):
     interp = Interpreter()
     try:
@@ -13,51 +43,77 @@ def run_from_file(filepath):
         print(f"An error occurred while executing the file: {e}")
 
 def start_repl():
+    warm_up()
     interp = Interpreter()
+    # Re-entered input reuses its parsed tree, as kernel cells do
+    parse = functools.lru_cache(maxsize=128)(interp.parse)
     print("mlscript v1.0.0 -- interactive REPL")
     print("Type 'quit' or 'exit' to leave.")
 
-    buffer = ""
+    lines = []  # Lines of a statement whose brackets aren't closed yet
+    open_braces = open_parens = open_brackets = 0
     prompt = "mlscript> "
+    # Piped input (`cat script.ms | mlscript`) skips the prompts and readline's per-line cost
+    read_line = None if sys.stdin.isatty() else sys.stdin.readline
 
     while True:
         try:
-            line = input(prompt)
+            if read_line is None:
+                line = input(prompt)
+            else:
+                line = read_line()
+                if not line:
+                    break
+                line = line.rstrip('\n')
 
             if line.strip().lower() in ("quit", "exit"):
                 break
 
-            buffer += line
+            lines.append(line)
+            # Balances are updated per line rather than recounted over the whole statement
+            open_braces += line.count('{') - line.count('}')
+            open_parens += line.count('(') - line.count(')')
+            open_brackets += line.count('[') - line.count(']')
 
-            if (buffer.count('{') > buffer.count('}') or
-                buffer.count('(') > buffer.count(')') or
-                buffer.count('[') > buffer.count(']')):
+            if open_braces > 0 or open_parens > 0 or open_brackets > 0:
                 prompt = "...       "
-                buffer += "\n"
-                continue
-            
-            if not buffer.strip():
-                buffer = ""
-                prompt = "mlscript> "
                 continue
-            
-            interp.run(buffer)
 
-            buffer = ""
+            buffer = "\n".join(lines)
+            lines = []
+            open_braces = open_parens = open_brackets = 0
             prompt = "mlscript> "
 
+            if buffer.strip():
+                interp.execute(parse(buffer))
+
         except ReturnSignal:
              print("SyntaxError: 'return' can only be used inside a function.")
-             buffer = ""
+             lines = []
+             open_braces = open_parens = open_brackets = 0
              prompt = "mlscript> "
         except Exception as e:
             print(f"Error: {e}")
-            buffer = ""
+            lines = []
+            open_braces = open_parens = open_brackets = 0
             prompt = "mlscript> "
 
+def enable_eager_jit():
+    """Has PyPy compile loops and functions on their first run, which pays off for
+    short scripts that would otherwise end before the JIT warms up. No-op elsewhere."""
+    try:
+        import pypyjit
+    except ImportError:
+        return
+    pypyjit.set_param("threshold=1,function_threshold=1")
+
 def main():
-    if len(sys.argv) > 1:
-        run_from_file(sys.argv[1])
+    args = sys.argv[1:]
+    if '--jit-eager' in args:
+        args.remove('--jit-eager')
+        enable_eager_jit()
+    if args:
+        run_from_file(args[0])
     else:
         start_repl()
 
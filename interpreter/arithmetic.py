@@ -0,0 +1,62 @@
+# arithmetic.py
+
+# The evaluator does int arithmetic in a C int
+INT_MIN = -2 ** 31
+INT_MAX = 2 ** 31 - 1
+
+def make_arithmetic(evaluate):
+    """Builds the `+ - * /` functions used by the interpreter and the loop VM.
+
+    Plain float and int operands are computed in Python, which gives the same double
+    (or in-range int) result the evaluator would. Everything else - tensors, arrays,
+    strings, int overflow, division by zero - goes to the evaluator, so its results
+    and error messages are unchanged. A call into the evaluator costs several times
+    more than the type checks done here.
+    """
+    def scalars(left, right):
+        # Exact type checks keep bools (an int subclass) and numpy scalars on the evaluator
+        left_type = type(left)
+        right_type = type(right)
+        if left_type is int:
+            if not INT_MIN <= left <= INT_MAX:
+                return None
+        elif left_type is not float:
+            return None
+        if right_type is int:
+            if not INT_MIN <= right <= INT_MAX:
+                return None
+        elif right_type is not float:
+            return None
+        return left_type is int and right_type is int
+
+    def add(left, right):
+        both_ints = scalars(left, right)
+        if both_ints is not None:
+            result = left + right
+            if not both_ints or INT_MIN <= result <= INT_MAX:
+                return result
+        return evaluate('+', left, right)
+
+    def subtract(left, right):
+        both_ints = scalars(left, right)
+        if both_ints is not None:
+            result = left - right
+            if not both_ints or INT_MIN <= result <= INT_MAX:
+                return result
+        return evaluate('-', left, right)
+
+    def multiply(left, right):
+        both_ints = scalars(left, right)
+        if both_ints is not None:
+            result = left * right
+            if not both_ints or INT_MIN <= result <= INT_MAX:
+                return result
+        return evaluate('*', left, right)
+
+    def divide(left, right):
+        # Both operands convert to doubles exactly, so Python's true division rounds the same way
+        if scalars(left, right) is not None and right:
+            return left / right
+        return evaluate('/', left, right)
+
+    return {'+': add, '-': subtract, '*': multiply, '/': divide}
@@ -2,105 +2,256 @@
 
 class Node:
     """Base class for all Abstract Syntax Tree nodes."""
-    pass
+    # Every node class declares __slots__ so nodes carry no per-instance __dict__.
+    __slots__ = ()
+
+_node_fields = {}
+
+def node_fields(node_class):
+    """Returns the attribute names declared in a node class's __slots__, base classes included.
+
+    Underscore-prefixed slots hold interpreter caches, not children, and are left out.
+    """
+    fields = _node_fields.get(node_class)
+    if fields is None:
+        fields = tuple(
+            name
+            for klass in node_class.__mro__
+            for name in getattr(klass, '__slots__', ())
+            if not name.startswith('_')
+        )
+        _node_fields[node_class] = fields
+    return fields
+
+def iter_child_nodes(node):
+    """Yields the direct child nodes of an AST node, looking inside lists, tuples and dicts."""
+    pending = [getattr(node, name, None) for name in node_fields(type(node))]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, Node):
+            yield value
+        elif isinstance(value, (list, tuple)):
+            pending.extend(value)
+        elif isinstance(value, dict):
+            pending.extend(value.values())
 
 class Number(Node):
     """Represents a literal integer or float value."""
+    __slots__ = ('value', 'line')
     def __init__(self, token):
-        self.token = token
         self.value = token[1]
+        self.line = token[2]
 
 class StringLiteral(Node):
     """Represents a string literal."""
+    __slots__ = ('value', 'line')
     def __init__(self, token):
-        self.token = token
-        self.value = token[1] 
+        self.value = token[1]
+        self.line = token[2]
 
 class BooleanLiteral(Node):
     """Represents a boolean literal."""
+    __slots__ = ('value', 'line')
     def __init__(self, token):
-        self.token = token
-        self.value = token[1] 
+        self.value = token[1]
+        self.line = token[2]
 
 class ListLiteral(Node):
     """Represents a list literal."""
+    __slots__ = ('elements', 'line', '_constant')
     def __init__(self, start_token,elements):
-        self.token = start_token
         self.elements = elements
+        self.line = start_token[2]
+        self._constant = None
 
 class DictLiteral(Node):
     """Represents a dictionary literal."""
+    __slots__ = ('pairs', 'line', '_constant')
     def __init__(self, start_token, pairs):
-        self.token = start_token
         self.pairs = pairs
+        self.line = start_token[2]
+        self._constant = None
 
 class TupleLiteral(Node):
     """Represents a tuple literal."""
+    __slots__ = ('elements', 'line', '_constant')
     def __init__(self, start_token, elements):
-        self.token = start_token
-        self.elements = elements                                                
+        self.elements = elements
+        self.line = start_token[2]
+        self._constant = None
 
 class Variable(Node):
     """Represents a variable identifier."""
+    __slots__ = ('name', 'line', 'slot')
     def __init__(self, token):
-        self.token = token
         self.name = token[1]
+        self.line = token[2]
+        self.slot = None  # Frame slot assigned by the resolver for function locals
 
 class AttributeAccess(Node):
     """Represents an attribute access (e.g., object.attribute)."""
+    __slots__ = ('obj', 'attribute', 'line', '_cached_class', '_cached_result')
     def __init__(self,obj,attribute_name_token):
         self.obj = obj
-        self.attribute= attribute_name_token[1]  
-        self.token = attribute_name_token
+        self.attribute = attribute_name_token[1]
+        self.line = attribute_name_token[2]
+        # Monomorphic inline cache for method lookups, filled in by the interpreter
+        self._cached_class = None
+        self._cached_result = None
 
 class IndexAccess(Node):
     """Represents an index access operation (e.g., list[index])."""
+    __slots__ = ('collection', 'index_expr', 'line')
     def __init__(self, collection, index_expr):
         self.collection = collection  # This is a Variable or ListLiteral node
         self.index_expr = index_expr
-        self.token = collection.token
+        self.line = collection.line
 
 class IndexAssign(Node):
     """Represents an index assignment operation (e.g., list[index] = value)."""
+    __slots__ = ('collection', 'index_expr', 'value_expr', 'line')
     def __init__(self, collection, index_expr, value_expr):
         self.collection = collection  # This is a Variable or ListLiteral node
         self.index_expr = index_expr
         self.value_expr = value_expr
-        self.token = collection.token
-        
+        self.line = collection.line
 
 class UnaryOp(Node):
     """Represents a unary operation (e.g., -x, !x)."""
+    __slots__ = ('op', 'expr', 'line')
     def __init__(self, op_token,expr):
-        self.token = op_token
         self.op = op_token[1]  # The operator (e.g., '-', '!')
         self.expr = expr
+        self.line = op_token[2]
 
 class BinOp(Node):
     """Represents a binary operation (e.g., +, -, *, /, ==)."""
+    __slots__ = ('left', 'op', 'right', 'line')
     def __init__(self, left, op_token, right):
         self.left = left
-        self.op_token = op_token
+        self.op = op_token[1]
         self.right = right
+        self.line = op_token[2]
+
+class AddOp(BinOp):
+    """Represents an addition (left + right)."""
+    __slots__ = ()
+
+class SubOp(BinOp):
+    """Represents a subtraction (left - right)."""
+    __slots__ = ()
+
+class MulOp(BinOp):
+    """Represents a multiplication (left * right)."""
+    __slots__ = ()
+
+class DivOp(BinOp):
+    """Represents a division (left / right)."""
+    __slots__ = ()
+
+class EqOp(BinOp):
+    """Represents an equality comparison (left == right)."""
+    __slots__ = ()
+
+class NeOp(BinOp):
+    """Represents an inequality comparison (left != right)."""
+    __slots__ = ()
+
+class LtOp(BinOp):
+    """Represents a less-than comparison (left < right)."""
+    __slots__ = ()
+
+class LteOp(BinOp):
+    """Represents a less-than-or-equal comparison (left <= right)."""
+    __slots__ = ()
+
+class GtOp(BinOp):
+    """Represents a greater-than comparison (left > right)."""
+    __slots__ = ()
+
+class GteOp(BinOp):
+    """Represents a greater-than-or-equal comparison (left >= right)."""
+    __slots__ = ()
+
+class InOp(BinOp):
+    """Represents a membership test (left in right)."""
+    __slots__ = ('container_literal',)
+    def __init__(self, left, op_token, right):
+        super().__init__(left, op_token, right)
+        # A literal container on the right never needs its type checked at runtime
+        self.container_literal = isinstance(right, (ListLiteral, StringLiteral, DictLiteral, TupleLiteral))
+
+class NotInOp(InOp):
+    """Represents a negated membership test (left not in right)."""
+    __slots__ = ()
+
+BINARY_OPS = {
+    '+': AddOp, '-': SubOp, '*': MulOp, '/': DivOp,
+    '==': EqOp, '!=': NeOp, '<': LtOp, '<=': LteOp, '>': GtOp, '>=': GteOp,
+    'in': InOp, 'not in': NotInOp,
+}
+
+class VarLtConst(LtOp):
+    """Super-instruction for `name < number`, the usual loop test."""
+    __slots__ = ()
+
+class ArithChain(Node):
+    """A left-nested run of arithmetic like `a + b * c - d`, evaluated in one loop.
+
+    `steps` holds an (operator, right operand, line) tuple per operator, applied in
+    order to the running value that starts at `first`.
+    """
+    __slots__ = ('first', 'steps', 'line')
+    def __init__(self, first, steps):
+        self.first = first
+        self.steps = steps
+        self.line = steps[0][2]
+
+def make_binop(left, op_token, right):
+    """Builds the specialised BinOp subclass for an operator token."""
+    node_class = BINARY_OPS.get(op_token[1], BinOp)
+    if node_class is LtOp and isinstance(left, Variable) and isinstance(right, Number):
+        node_class = VarLtConst
+    return node_class(left, op_token, right)
 
 class Assign(Node):
     """Represents a variable assignment (e.g., x = 5)."""
+    __slots__ = ('left', 'expr')
     def __init__(self, left, expr):
         self.left = left  # This is a Variable node
         self.expr = expr
 
+class IncrementAssign(Assign):
+    """Super-instruction for `name = name + number` and `name = name - number`."""
+    __slots__ = ('op', 'delta', 'line')
+    def __init__(self, left, expr):
+        super().__init__(left, expr)
+        self.op = expr.op
+        self.delta = expr.right.value
+        self.line = expr.line
+
+def make_assign(left, expr):
+    """Builds an Assign, fusing a constant increment of the same variable into one node."""
+    if (isinstance(expr, (AddOp, SubOp)) and isinstance(expr.left, Variable)
+            and expr.left.name == left.name and isinstance(expr.right, Number)):
+        return IncrementAssign(left, expr)
+    return Assign(left, expr)
+
 class PrintStatement(Node):
     """Represents a print statement."""
+    __slots__ = ('exprs',)
     def __init__(self, exprs):
         self.exprs = exprs
 
 class Block(Node):
     """Represents a block of statements { ... }."""
+    __slots__ = ('statements',)
     def __init__(self, statements):
         self.statements = statements
 
 class IfStatement(Node):
     """Represents an if-else statement."""
+    __slots__ = ('condition', 'if_block', 'else_block')
     def __init__(self, condition, if_block, else_block=None):
         self.condition = condition
         self.if_block = if_block
@@ -108,39 +259,80 @@ class IfStatement(Node):
 
 class WhileStatement(Node):
     """Represents a while loop."""
+    __slots__ = ('condition', 'body', '_bytecode', '_hot_loop')
     def __init__(self, condition, body):
         self.condition = condition
         self.body = body
+        self._bytecode = None  # Filled in by the compiler on first execution
+        self._hot_loop = None  # (interpreter, loop compiled to Python) once the VM finds it hot
 
 class ForStatement(Node):
     """Represents a for loop."""
+    __slots__ = ('variable', 'iterable', 'body', '_bytecode', '_hot_loop')
     def __init__(self, variable, iterable, body):
         self.variable = variable
         self.iterable = iterable 
         self.body = body
+        self._bytecode = None  # Filled in by the compiler on first execution
+        self._hot_loop = None  # (interpreter, loop compiled to Python) once the VM finds it hot
+
+def literal_defaults(param_names, param_defaults):
+    """Maps each parameter whose default is a literal to the literal's value."""
+    return {
+        name: default_node.value
+        for name, default_node in zip(param_names, param_defaults)
+        if isinstance(default_node, (Number, StringLiteral, BooleanLiteral))
+    }
 
 class FunctionDef(Node):
     """Represents a function definition."""
+    __slots__ = ('name', 'body', 'param_names', 'param_defaults', 'param_slots', 'constant_defaults',
+                 'frame_size', 'private_frame', 'needs_scope', 'calls', '_native',
+                 '_native_uses_range', '_compiled_body')
     def __init__(self, name_token, params, body):
         self.name = name_token[1]
-        self.params = params  # List of Variable nodes
         self.body = body      # Block node
+        # `params` is a list of (Variable, default expression or None) pairs. It is kept as
+        # parallel tuples, so binding arguments allocates nothing.
+        self.param_names = tuple(param_node.name for param_node, _ in params)
+        self.param_defaults = tuple(default_node for _, default_node in params)  # None where there is no default
+        self.param_slots = (None,) * len(params)  # Frame slot per parameter, set by the resolver
+        # Literal defaults are evaluated once here instead of on every call
+        self.constant_defaults = literal_defaults(self.param_names, self.param_defaults)
+        self.frame_size = 0   # Number of local slots, set by the resolver
+        self.private_frame = False  # True if nothing can read the locals by name, set by the resolver
+        self.needs_scope = True  # False if a call never writes its own evaluator scope, set by the resolver
+        self.calls = 0        # Tree-walked calls so far, for the numeric JIT warmup
+        self._native = None   # Compiled numeric body (False if the body can't be compiled)
+        self._native_uses_range = False  # The compiled body loops over the builtin `range`
+        self._compiled_body = None  # (interpreter, body compiled to Python), made on the first call
 
 class FunctionCall(Node):
     """Represents a function call."""
+    __slots__ = ('callee', 'args', 'kwargs', 'line', '_callee_name', '_constant_args', '_cached_type', '_call_kind')
     def __init__(self, callee, args, kwargs):
         self.callee = callee
         self.args = args
         self.kwargs = kwargs
-        self.token = callee.token  
+        self.line = callee.line
+        # Name to look up among user functions, if the callee is a plain identifier
+        self._callee_name = callee.name if isinstance(callee, Variable) else None
+        # Positional argument values when every one is a literal, set by the constant folder
+        self._constant_args = None
+        # Inline cache of how the last callee type seen here gets called
+        self._cached_type = None
+        self._call_kind = None
 
 class ReturnStatement(Node):
     """Represents a return statement."""
+    __slots__ = ('expr', 'tail_call')
     def __init__(self, expr):
         self.expr = expr
+        self.tail_call = False  # Returns a call to its own function from tail position, set by the resolver
 
 class SliceNode(Node):
     """Represents a slice operation (e.g., list[start:end:step])."""
+    __slots__ = ('start', 'stop', 'step')
     def __init__(self, start=None, stop=None, step=None):
         self.start = start
         self.stop = stop
@@ -148,25 +340,33 @@ class SliceNode(Node):
 
 class ImportStatement(Node):
     """Represents an import statement."""
+    __slots__ = ('module_name', 'alias', 'line')
     def __init__(self,module_name_token, alias_token):
         self.module_name = module_name_token[1]  
-        self.alias = alias_token[1] 
-        self.token = module_name_token  
+        self.alias = alias_token[1]
+        self.line = module_name_token[2]
 
 class WithStatement(Node):
     """Represents a with statement."""
+    __slots__ = ('context_expr', 'body')
     def __init__(self, context_expr, body):
         self.context_expr = context_expr
         self.body = body
 
+class NoGradBlock(WithStatement):
+    """A `with no_grad { ... }` block, which the evaluator can run without the context manager protocol."""
+    __slots__ = ()
+
 class ThrowStatement(Node):
     """Represents a throw statement."""
+    __slots__ = ('expr', 'line')
     def __init__(self, token, expr):
-        self.token = token
         self.expr = expr
+        self.line = token[2]
 
 class TryCatch(Node):
     """Represents a try-catch block."""
+    __slots__ = ('try_block', 'catch_variable', 'catch_block', 'finally_block')
     def __init__(self, try_block, catch_variable, catch_block, finally_block=None):
         self.try_block = try_block
         self.catch_variable = catch_variable
@@ -175,37 +375,44 @@ class TryCatch(Node):
 
 class BreakStatement(Node):
     """Represents a break statement."""
+    __slots__ = ('line',)
     def __init__(self, token):
-        self.token = token
+        self.line = token[2]
 
 class ContinueStatement(Node):
     """Represents a continue statement."""
+    __slots__ = ('line',)
     def __init__(self, token):
-        self.token = token
+        self.line = token[2]
 
 class ClassDef(Node):
     """Represents a class definition"""
+    __slots__ = ('name', 'line', 'parents', 'methods', '_methods_by_name')
     def __init__(self,name_token,parents,methods):
         self.name = name_token[1]
-        self.token = name_token
-        self.parents = parents  
+        self.line = name_token[2]
+        self.parents = parents
         self.methods = methods
+        self._methods_by_name = {method.name: method for method in methods}
 
 class AttributeAssign(Node):
     """Represents assigning a value to an object's attribute."""
-    def __init__(self,obj,attribute_token,value_expr):
-        self.obj=obj
-        self.attribute = attribute_token[1]
-        self.token = attribute_token
+    __slots__ = ('obj', 'attribute', 'line', 'value_expr')
+    def __init__(self, obj, attribute, line, value_expr):
+        self.obj = obj
+        self.attribute = attribute
+        self.line = line
         self.value_expr = value_expr
 
 class SuperNode(Node):
     """Represents the 'super' keyword"""
+    __slots__ = ('line',)
     def __init__(self, token):
-        self.token = token
+        self.line = token[2]
 
 class NetworkLiteral(Node):
     """Represents a network block with input, layers, optimizer, and loss."""
+    __slots__ = ('attributes', 'line')
     def __init__(self, token, attributes):
-        self.token = token
-        self.attributes = attributes
\ No newline at end of file
+        self.attributes = attributes
+        self.line = token[2]
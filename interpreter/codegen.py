@@ -0,0 +1,449 @@
+# codegen.py
+import math
+
+from .ast_nodes import *
+from .resolver import UNSET
+from .control import BREAK, CONTINUE, RETURN
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# How many calls a function gets on the tree walker before we try to compile it.
+JIT_WARMUP_CALLS = 2
+
+ARITHMETIC_OPS = ('+', '-', '*', '/')
+COMPARISON_OPS = ('==', '!=', '<', '<=', '>', '>=')
+
+class Unsupported(Exception):
+    """Raised when a function body falls outside the numeric subset."""
+    pass
+
+class NumericCodegen:
+    """Translates a purely numeric FunctionDef into Python source.
+
+    Only float parameters and float locals are allowed, so every arithmetic
+    operation is a double operation exactly like the evaluator's. Integers may
+    appear as literals mixed with floats, and every name must be bound in the
+    function before it is read, so the body never depends on the caller's scope.
+    `for` loops over a range of int literals are allowed too: names assigned in
+    the loop body get their own Python variable, seeded from the enclosing one,
+    because the loop's scope hides those assignments once it ends.
+    """
+    def __init__(self):
+        self.lines = []
+        self.loops = 0
+        self.uses_range = False  # The body calls `range`, which the caller must not have rebound
+
+    def generate(self, func_def):
+        if any(default_node is not None for default_node in func_def.param_defaults):
+            raise Unsupported('default parameter')
+        params = [self.name(name) for name in func_def.param_names]
+        self.lines.append(f"def {self.name(func_def.name)}({', '.join(params)}):")
+        # Maps each bound name to its Python variable and static type
+        defined = {name: (self.name(name), 'float') for name in func_def.param_names}
+        self.block(func_def.body, defined, {}, 1)
+        return '\n'.join(self.lines)
+
+    def name(self, name):
+        # Prefixed so mlscript names can never clash with Python keywords or builtins
+        return f"v_{name}"
+
+    def emit(self, line, depth):
+        self.lines.append('    ' * depth + line)
+
+    # --- Statements ---
+
+    def block(self, node, defined, targets, depth):
+        """`targets` maps names assigned in the innermost for loop to that loop's variables."""
+        statements = node.statements if isinstance(node, Block) else [node]
+        if not statements:
+            self.emit('pass', depth)
+        for statement in statements:
+            self.statement(statement, defined, targets, depth)
+
+    def statement(self, node, defined, targets, depth):
+        if isinstance(node, Assign):
+            source, kind = self.expression(node.expr, defined)
+            if kind != 'float':
+                raise Unsupported('non-float local')
+            target = targets.get(node.left.name) or self.name(node.left.name)
+            self.emit(f"{target} = {source}", depth)
+            defined[node.left.name] = (target, 'float')
+        elif isinstance(node, IfStatement):
+            self.emit(f"if {self.condition(node.condition, defined)}:", depth)
+            self.block(node.if_block, dict(defined), targets, depth + 1)
+            if node.else_block:
+                self.emit('else:', depth)
+                self.block(node.else_block, dict(defined), targets, depth + 1)
+        elif isinstance(node, WhileStatement):
+            self.emit(f"while {self.condition(node.condition, defined)}:", depth)
+            self.block(node.body, dict(defined), targets, depth + 1)
+        elif isinstance(node, ForStatement):
+            self.for_loop(node, defined, depth)
+        elif isinstance(node, ReturnStatement):
+            source, kind = self.expression(node.expr, defined)
+            if kind != 'float':
+                raise Unsupported('non-float return value')
+            self.emit(f"return {source}", depth)
+        else:
+            raise Unsupported(type(node).__name__)
+
+    def for_loop(self, node, defined, depth):
+        iterable = node.iterable
+        if not (isinstance(iterable, FunctionCall) and iterable._callee_name == 'range' and 'range' not in defined
+                and not iterable.kwargs and 1 <= len(iterable.args) <= 3
+                and all(isinstance(arg, Number) and type(arg.value) is int for arg in iterable.args)):
+            raise Unsupported('for loop over anything but a literal range')
+        loop_name = node.variable.name
+        assigned = self.assigned_names(node.body)
+        if loop_name in assigned:
+            raise Unsupported('assignment to the loop variable')
+        self.uses_range = True
+        self.loops += 1
+        prefix = f"s{self.loops}_"
+        targets = {name: prefix + name for name in assigned}
+        loop_defined = dict(defined)
+        for name in assigned:
+            if name in defined:
+                # The first read in the loop sees the enclosing value until the loop assigns its own
+                self.emit(f"{targets[name]} = {defined[name][0]}", depth)
+                loop_defined[name] = (targets[name], 'float')
+        loop_variable = prefix + loop_name
+        loop_defined[loop_name] = (loop_variable, 'int')
+        bounds = ', '.join(repr(arg.value) for arg in iterable.args)
+        self.emit(f"for {loop_variable} in range({bounds}):", depth)
+        self.block(node.body, loop_defined, targets, depth + 1)
+
+    def assigned_names(self, node):
+        """Names a loop body assigns in the loop's own scope (nested loops have their own)."""
+        if isinstance(node, Assign):
+            return {node.left.name}
+        if isinstance(node, (ForStatement, FunctionDef)):
+            return set()
+        names = set()
+        for child in iter_child_nodes(node):
+            names |= self.assigned_names(child)
+        return names
+
+    # --- Expressions ---
+
+    def condition(self, node, defined):
+        source, kind = self.expression(node, defined)
+        return source
+
+    def expression(self, node, defined):
+        """Returns the Python source for an expression and its static type."""
+        if isinstance(node, Number):
+            # repr() of a folded inf or nan isn't a Python literal
+            if type(node.value) is float and math.isfinite(node.value):
+                return repr(node.value), 'float'
+            if type(node.value) is int:
+                return repr(node.value), 'int'
+        elif isinstance(node, Variable):
+            if node.name in defined:
+                return defined[node.name]
+        elif isinstance(node, UnaryOp):
+            source, kind = self.expression(node.expr, defined)
+            if node.op in ('-', '+') and kind in ('float', 'int'):
+                return f"({node.op}{source})", kind
+        elif isinstance(node, BinOp):
+            op = node.op
+            left, left_kind = self.expression(node.left, defined)
+            right, right_kind = self.expression(node.right, defined)
+            numeric = left_kind in ('float', 'int') and right_kind in ('float', 'int')
+            if op in ARITHMETIC_OPS and numeric and 'float' in (left_kind, right_kind):
+                return f"({left} {op} {right})", 'float'
+            if op in COMPARISON_OPS and numeric:
+                return f"({left} {op} {right})", 'bool'
+        elif isinstance(node, ArithChain):
+            source, kind = self.expression(node.first, defined)
+            for op, term, _ in node.steps:
+                right, right_kind = self.expression(term, defined)
+                if not (kind in ('float', 'int') and right_kind in ('float', 'int') and 'float' in (kind, right_kind)):
+                    raise Unsupported('non-float arithmetic')
+                source, kind = f"({source} {op} {right})", 'float'
+            return source, kind
+        raise Unsupported(type(node).__name__)
+
+def compile_numeric(func_def):
+    """Compiles a numeric function to native code (plain Python without numba), or returns None."""
+    codegen = NumericCodegen()
+    try:
+        source = codegen.generate(func_def)
+    except Unsupported:
+        return None
+    func_def._native_uses_range = codegen.uses_range
+    namespace = {}
+    exec(source, namespace)
+    function = namespace[f"v_{func_def.name}"]
+    if numba is not None:
+        # Compile eagerly for the only signature we ever call it with, so a typing
+        # failure (e.g. a path that falls off the end and returns None) shows up
+        # here and leaves us with the plain Python version instead of failing a call.
+        signature = f"float64({', '.join(['float64'] * len(func_def.param_names))})"
+        try:
+            function = numba.njit(signature, nogil=True)(function)
+        except Exception:
+            pass
+    return function
+
+# Statements whose visitors may hand back a BREAK/CONTINUE/RETURN sentinel
+FLOW_STATEMENTS = (Block, IfStatement, WhileStatement, ForStatement, TryCatch, WithStatement,
+                   ReturnStatement, BreakStatement, ContinueStatement)
+ARITHMETIC_NODES = {AddOp: '+', SubOp: '-', MulOp: '*', DivOp: '/'}
+COMPARISON_NODES = {EqOp: '==', NeOp: '!=', LtOp: '<', VarLtConst: '<', LteOp: '<=', GtOp: '>', GteOp: '>='}
+ARITHMETIC_NAMES = {'+': 'add', '-': 'subtract', '*': 'multiply', '/': 'divide'}
+
+class BodyCodegen:
+    """Translates a function body, or a single hot loop, into Python source that does the
+    tree walker's work inline.
+
+    Blocks, ifs, loops, assignments, returns, variable reads, literals, arithmetic
+    and comparisons are written out directly; any other node is handed to its visit_*
+    method, so every body can be compiled. Expressions are flattened into temporaries,
+    which keeps the evaluation order and lets arithmetic errors get their line number
+    the same way visit_BinOp does.
+    """
+    def __init__(self):
+        self.lines = []
+        self.nodes = []
+        self.consts = []
+        self.temps = 0
+        self.private = None  # Whether slotted locals skip the scope; None if only known at run time
+        self.loop_items = {}  # Loop variable name -> Python variable holding the current item
+        self.item_reads = {}  # Loop variable name -> reads of it that used that Python variable
+
+    def generate(self, func_def):
+        self.private = func_def.private_frame
+        self.emit('def body(frame):', 1)
+        self.block(func_def.body, 2, False)
+        return self.source()
+
+    def generate_loop(self, node):
+        """The loop runs in whatever call it appears in, so privacy is passed in. A for loop
+        taken over from the VM halfway through gets the VM's iterator and already open scope."""
+        self.emit('def body(frame, private, iterator):', 1)
+        if isinstance(node, ForStatement):
+            self.for_loop(node, 2, False, 'iterator')
+        else:
+            self.statement(node, 2, False)
+        return self.source()
+
+    def source(self):
+        header = ['def bind(interp, nodes, consts):',
+                  '    load = interp.visit_Variable',
+                  '    assign = interp.e.assign_variable',
+                  '    enter_scope = interp.e.enter_scope',
+                  '    exit_scope = interp.e.exit_scope',
+                  '    arithmetic = interp.arithmetic']
+        for op, name in ARITHMETIC_NAMES.items():
+            header.append(f"    {name} = arithmetic['{op}']")
+        for index, node in enumerate(self.nodes):
+            header.append(f"    n{index} = nodes[{index}]")
+            header.append(f"    f{index} = interp._visitor_for(n{index})")
+        for index in range(len(self.consts)):
+            header.append(f"    c{index} = consts[{index}]")
+        return '\n'.join(header + self.lines + ['    return body'])
+
+    def emit(self, line, depth):
+        self.lines.append('    ' * depth + line)
+
+    def temp(self):
+        self.temps += 1
+        return f"t{self.temps}"
+
+    def node(self, node):
+        self.nodes.append(node)
+        return len(self.nodes) - 1
+
+    def const(self, value):
+        self.consts.append(value)
+        return f"c{len(self.consts) - 1}"
+
+    # --- Statements ---
+
+    def block(self, node, depth, loop):
+        start = len(self.lines)
+        self.statement(node, depth, loop)
+        if len(self.lines) == start:
+            self.emit('pass', depth)
+
+    def statement(self, node, depth, loop):
+        node_type = type(node)
+        if node_type is Block:
+            for statement in node.statements:
+                self.statement(statement, depth, loop)
+        elif node_type is Assign or node_type is IncrementAssign:
+            if node_type is Assign:
+                value = self.expression(node.expr, depth)
+            else:
+                value = self.arithmetic(node.op, self.expression(node.expr.left, depth),
+                                        self.const(node.delta), node.line, depth)
+            if node.left.slot is not None:
+                self.emit(f"frame[{node.left.slot}] = {value}", depth)
+                if self.private:
+                    return
+                if self.private is None:
+                    self.emit('if not private:', depth)
+                    depth += 1
+            self.emit(f"assign({self.const(node.left.name)}, {value})", depth)
+        elif node_type is IfStatement:
+            condition = self.expression(node.condition, depth)
+            self.emit(f"if {condition}:", depth)
+            self.block(node.if_block, depth + 1, loop)
+            if node.else_block:
+                self.emit('else:', depth)
+                self.block(node.else_block, depth + 1, loop)
+        elif node_type is WhileStatement:
+            self.emit('while True:', depth)
+            condition = self.expression(node.condition, depth + 1)
+            self.emit(f"if not {condition}:", depth + 1)
+            self.emit('break', depth + 2)
+            self.block(node.body, depth + 1, True)
+        elif node_type is ForStatement:
+            self.for_loop(node, depth, loop, None)
+        elif node_type is ReturnStatement and not node.tail_call and node.expr is not None:
+            value = self.expression(node.expr, depth)
+            self.emit(f"interp._return_value = {value}", depth)
+            self.emit('return RETURN', depth)
+        elif node_type is BreakStatement:
+            self.emit('break' if loop else 'return BREAK', depth)
+        elif node_type is ContinueStatement:
+            self.emit('continue' if loop else 'return CONTINUE', depth)
+        else:
+            index = self.node(node)
+            if not isinstance(node, FLOW_STATEMENTS):
+                self.emit(f"f{index}(n{index})", depth)
+                return
+            self.emit(f"flow = f{index}(n{index})", depth)
+            if loop:
+                self.emit('if flow is BREAK:', depth)
+                self.emit('break', depth + 1)
+                self.emit('if flow is CONTINUE:', depth)
+                self.emit('continue', depth + 1)
+                self.emit('if flow is RETURN:', depth)
+            else:
+                self.emit('if flow is BREAK or flow is CONTINUE or flow is RETURN:', depth)
+            self.emit('return flow', depth + 1)
+
+    def for_loop(self, node, depth, loop, resume):
+        """Emits a for loop in its own evaluator scope; `resume` names a variable that may
+        already hold the loop's iterator, in which case its scope is already open."""
+        iterator = resume or self.temp()
+        if resume:
+            self.emit(f"if {resume} is None:", depth)
+            depth += 1
+        iterable = self.expression(node.iterable, depth)
+        self.emit('try:', depth)
+        self.emit(f"{iterator} = iter({iterable})", depth + 1)
+        self.emit('except TypeError:', depth)
+        self.emit('raise Exception("Runtime Error on line ' + str(node.iterable.line)
+                  + ': \'for\' loop can only iterate over an iterable such as a list, string, tuple or range.")', depth + 1)
+        self.emit('enter_scope()', depth)
+        if resume:
+            depth -= 1
+        name = node.variable.name
+        item = self.temp()
+        self.emit('try:', depth)
+        self.emit(f"for {item} in {iterator}:", depth + 1)
+        assign_at = len(self.lines)
+        # Unless the body can rebind the name, reads of it in the body see the current item
+        inline = not rebinds(node.body, name)
+        if inline:
+            self.loop_items[name] = item
+            self.item_reads[name] = 0
+        self.block(node.body, depth + 2, True)
+        # The scope only needs the item if something may still look it up by name
+        if (not inline or has_call(node.body)
+                or count_reads(node.body, name) != self.item_reads.pop(name)):
+            self.lines.insert(assign_at, '    ' * (depth + 2) + f"assign({self.const(name)}, {item})")
+        self.loop_items.pop(name, None)
+        self.emit('finally:', depth)
+        self.emit('exit_scope()', depth + 1)
+
+    # --- Expressions ---
+
+    def expression(self, node, depth):
+        """Emits the statements that compute an expression and returns the name holding it."""
+        node_type = type(node)
+        if node_type is Number or node_type is StringLiteral or node_type is BooleanLiteral:
+            return self.const(node.value)
+        result = self.temp()
+        if node_type is Variable and node.slot is not None:
+            index = self.node(node)
+            self.emit(f"{result} = frame[{node.slot}]", depth)
+            self.emit(f"if {result} is UNSET:", depth)
+            self.emit(f"{result} = load(n{index})", depth + 1)
+        elif node_type is Variable and node.name in self.loop_items:
+            self.item_reads[node.name] += 1
+            return self.loop_items[node.name]
+        elif node_type is Variable:
+            self.emit(f"{result} = load(n{self.node(node)})", depth)
+        elif node_type in ARITHMETIC_NODES:
+            left = self.expression(node.left, depth)
+            right = self.expression(node.right, depth)
+            return self.arithmetic(ARITHMETIC_NODES[node_type], left, right, node.line, depth)
+        elif node_type is ArithChain:
+            value = self.expression(node.first, depth)
+            for op, term, line_num in node.steps:
+                value = self.arithmetic(op, value, self.expression(term, depth), line_num, depth)
+            return value
+        elif node_type in COMPARISON_NODES:
+            left = self.expression(node.left, depth)
+            right = self.expression(node.right, depth)
+            self.emit(f"{result} = {left} {COMPARISON_NODES[node_type]} {right}", depth)
+        else:
+            index = self.node(node)
+            self.emit(f"{result} = f{index}(n{index})", depth)
+        return result
+
+    def arithmetic(self, op, left, right, line_num, depth):
+        result = self.temp()
+        self.emit('try:', depth)
+        self.emit(f"{result} = {ARITHMETIC_NAMES[op]}({left}, {right})", depth + 1)
+        self.emit('except Exception as e:', depth)
+        self.emit('raise Exception(f"Runtime Error on line ' + str(line_num) + ': {e}")', depth + 1)
+        return result
+
+def rebinds(node, name):
+    """Checks whether running `node` can bind `name` in the scope it runs in or a nested one."""
+    if isinstance(node, Assign):
+        if node.left.name == name:
+            return True
+    elif isinstance(node, ForStatement):
+        if node.variable.name == name:
+            return True
+    elif isinstance(node, TryCatch):
+        if node.catch_variable and node.catch_variable.name == name:
+            return True
+    elif isinstance(node, ImportStatement):
+        if node.alias == name:
+            return True
+    elif isinstance(node, ClassDef):
+        if node.name == name:
+            return True
+    return any(rebinds(child, name) for child in iter_child_nodes(node))
+
+def has_call(node):
+    return isinstance(node, FunctionCall) or any(has_call(child) for child in iter_child_nodes(node))
+
+def count_reads(node, name):
+    count = 1 if isinstance(node, Variable) and node.name == name else 0
+    return count + sum(count_reads(child, name) for child in iter_child_nodes(node))
+
+def compile_body(func_def, interpreter):
+    """Compiles a function body to a Python function of the call's frame for one interpreter."""
+    codegen = BodyCodegen()
+    return _bind(codegen, codegen.generate(func_def), f"<mlscript:{func_def.name}>", interpreter)
+
+def compile_hot_loop(node, interpreter):
+    """Compiles a while/for loop to a Python function of (frame, private, iterator)."""
+    codegen = BodyCodegen()
+    return _bind(codegen, codegen.generate_loop(node), "<mlscript loop>", interpreter)
+
+def _bind(codegen, source, filename, interpreter):
+    namespace = {'UNSET': UNSET, 'BREAK': BREAK, 'CONTINUE': CONTINUE, 'RETURN': RETURN}
+    exec(compile(source, filename, 'exec'), namespace)
+    return namespace['bind'](interpreter, tuple(codegen.nodes), tuple(codegen.consts))
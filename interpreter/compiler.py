@@ -0,0 +1,532 @@
+# compiler.py
+import operator
+from .ast_nodes import *
+from .resolver import UNSET
+from .control import RETURN, HotLoop
+
+# --- Opcodes ---
+# Ordered roughly by how often they execute; the VM tests them in this order.
+LOAD_NAME = 0
+LOAD_CONST = 1
+STORE_NAME = 2
+ARITH = 3
+COMPARE = 4
+JUMP_IF_FALSE = 5
+JUMP = 6
+FOR_ITER = 7
+POP_TOP = 8
+EVAL = 9
+EXEC = 10
+INDEX_LOAD = 11
+INDEX_STORE = 12
+CONTAINS = 13
+UNARY_NEG = 14
+BUILD_LIST = 15
+BUILD_TUPLE = 16
+BUILD_DICT = 17
+BUILD_SLICE = 18
+PRINT = 19
+FOR_SETUP = 20
+EXIT_SCOPE = 21
+LOAD_SLOT = 22
+STORE_SLOT = 23
+# Super-instructions for the common `x = x + n` and `x < n` patterns
+INCREMENT = 24
+VAR_LT_CONST = 25
+# Binary operators whose right operand is a literal, applied to the top of the stack
+ARITH_CONST = 26
+COMPARE_CONST = 27
+POP_ITER = 28
+# Pushes a fresh copy of a prebuilt all-literal list or dict
+COPY_CONST = 29
+
+COMPARE_OPS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+# Which tier runs a loop: loops that a compiled function body (codegen.compile_body)
+# writes out inline never reach the VM. Loops that do reach visit_WhileStatement or
+# visit_ForStatement - top-level loops, and loops inside a statement a compiled body
+# hands back to the tree walker such as try - run here for HOT_LOOP_ITERATIONS
+# iterations and then as codegen.compile_hot_loop output. A loop that compile_loop
+# rejects stays on the tree walker.
+HOT_LOOP_ITERATIONS = 1000
+
+class Code:
+    """A compiled statement: parallel opcode and operand arrays indexed by the program counter."""
+    def __init__(self):
+        self.ops = bytearray()
+        self.args = []
+        self.head = None  # Start of an iteration of the outermost loop
+        self.budget = HOT_LOOP_ITERATIONS  # Iterations left before the loop counts as hot
+
+    def emit(self, op, arg=None):
+        self.ops.append(op)
+        self.args.append(arg)
+        return len(self.ops) - 1
+
+    def here(self):
+        return len(self.ops)
+
+    def patch(self, index, target):
+        self.args[index] = target
+
+class Unsupported(Exception):
+    """Raised when a statement cannot be lowered to bytecode."""
+    pass
+
+def line_of(node):
+    """Returns the source line of a node for error messages, if it records one."""
+    return getattr(node, 'line', None)
+
+def has_loop_control(node):
+    """Checks whether a break/continue inside `node` would escape to an enclosing loop."""
+    if isinstance(node, (BreakStatement, ContinueStatement)):
+        return True
+    if isinstance(node, (WhileStatement, ForStatement, FunctionDef, ClassDef)):
+        return False
+    return any(has_loop_control(child) for child in iter_child_nodes(node))
+
+class Compiler:
+    """Lowers a loop statement into flat bytecode.
+
+    Expressions and statements without a dedicated opcode are emitted as EVAL/EXEC
+    instructions that hand the node back to the tree-walking interpreter, so any loop
+    can be compiled as long as no break/continue hides inside such a statement.
+    """
+    def __init__(self):
+        self.code = Code()
+        # One entry per enclosing loop: (continue target, list of break jumps to patch)
+        self.loops = []
+
+    def compile(self, node):
+        self.statement(node)
+        return self.code
+
+    # --- Statements ---
+
+    def handler(self, prefix, node):
+        """Finds the compile method for a node, letting subclasses share their base's handler."""
+        for node_class in type(node).__mro__:
+            method = getattr(self, f'{prefix}_{node_class.__name__}', None)
+            if method is not None:
+                return method
+        return None
+
+    def statement(self, node):
+        method = self.handler('stmt', node)
+        if method is not None:
+            return method(node)
+        if self.handler('expr', node) is not None:
+            self.expression(node)
+            self.code.emit(POP_TOP)
+            return
+        if has_loop_control(node):
+            raise Unsupported(type(node).__name__)
+        self.code.emit(EXEC, node)
+
+    def stmt_Block(self, node):
+        for statement in node.statements:
+            self.statement(statement)
+
+    def stmt_Assign(self, node):
+        self.expression(node.expr)
+        if node.left.slot is None:
+            self.code.emit(STORE_NAME, node.left.name)
+        else:
+            self.code.emit(STORE_SLOT, (node.left.slot, node.left.name))
+
+    def stmt_IncrementAssign(self, node):
+        variable = node.expr.left
+        self.code.emit(INCREMENT, (node.left.slot, node.left.name, node.op, node.delta, variable.line, node.line))
+
+    def stmt_IndexAssign(self, node):
+        self.expression(node.collection)
+        self.expression(node.value_expr)
+        for index in node.index_expr:
+            self.expression(index)
+        self.code.emit(INDEX_STORE, (len(node.index_expr), node.line))
+
+    def stmt_PrintStatement(self, node):
+        for expr in node.exprs:
+            self.expression(expr)
+        self.code.emit(PRINT, len(node.exprs))
+
+    def stmt_IfStatement(self, node):
+        code = self.code
+        self.expression(node.condition)
+        to_else = code.emit(JUMP_IF_FALSE)
+        self.statement(node.if_block)
+        if node.else_block:
+            to_end = code.emit(JUMP)
+            code.patch(to_else, code.here())
+            self.statement(node.else_block)
+            code.patch(to_end, code.here())
+        else:
+            code.patch(to_else, code.here())
+
+    def stmt_WhileStatement(self, node):
+        code = self.code
+        head = code.here()
+        if code.head is None:
+            code.head = head
+        self.expression(node.condition)
+        to_exit = code.emit(JUMP_IF_FALSE)
+        breaks = []
+        self.loops.append((head, breaks))
+        self.statement(node.body)
+        self.loops.pop()
+        code.emit(JUMP, head)
+        exit_target = code.here()
+        code.patch(to_exit, exit_target)
+        for jump in breaks:
+            code.patch(jump, exit_target)
+
+    def stmt_ForStatement(self, node):
+        code = self.code
+        self.expression(node.iterable)
+        code.emit(FOR_SETUP, line_of(node.iterable))
+        head = code.here()
+        if code.head is None:
+            code.head = head
+        to_exit = code.emit(FOR_ITER)
+        code.emit(STORE_NAME, node.variable.name)
+        breaks = []
+        self.loops.append((head, breaks))
+        self.statement(node.body)
+        self.loops.pop()
+        code.emit(JUMP, head)
+        # A break leaves the iterator behind; normal exhaustion has already dropped it.
+        break_target = code.emit(POP_ITER)
+        code.patch(to_exit, code.here())
+        code.emit(EXIT_SCOPE)
+        for jump in breaks:
+            code.patch(jump, break_target)
+
+    def stmt_BreakStatement(self, node):
+        if not self.loops:
+            raise Unsupported('break outside loop')
+        self.loops[-1][1].append(self.code.emit(JUMP))
+
+    def stmt_ContinueStatement(self, node):
+        if not self.loops:
+            raise Unsupported('continue outside loop')
+        self.code.emit(JUMP, self.loops[-1][0])
+
+    # --- Expressions ---
+
+    def expression(self, node):
+        method = self.handler('expr', node)
+        if method is None:
+            self.code.emit(EVAL, node)
+        else:
+            method(node)
+
+    def expr_Number(self, node):
+        self.code.emit(LOAD_CONST, node.value)
+
+    expr_StringLiteral = expr_Number
+    expr_BooleanLiteral = expr_Number
+
+    def expr_Variable(self, node):
+        if node.slot is None:
+            self.code.emit(LOAD_NAME, (node.name, node.line))
+        else:
+            self.code.emit(LOAD_SLOT, (node.slot, node.name, node.line))
+
+    def expr_BinOp(self, node):
+        op = node.op
+        line_num = node.line
+        constant = isinstance(node.right, (Number, StringLiteral, BooleanLiteral))
+        if op in ('+', '-', '*', '/'):
+            if constant:
+                self.expression(node.left)
+                self.code.emit(ARITH_CONST, (op, node.right.value, line_num))
+                return
+            instruction = (ARITH, (op, line_num))
+        elif op in COMPARE_OPS:
+            if constant:
+                self.expression(node.left)
+                self.code.emit(COMPARE_CONST, (COMPARE_OPS[op], node.right.value))
+                return
+            instruction = (COMPARE, COMPARE_OPS[op])
+        elif op in ('in', 'not in'):
+            instruction = (CONTAINS, (op, line_num))
+        else:
+            # Let the tree walker report the unsupported operator
+            self.code.emit(EVAL, node)
+            return
+        self.expression(node.left)
+        self.expression(node.right)
+        self.code.emit(*instruction)
+
+    def expr_ArithChain(self, node):
+        self.expression(node.first)
+        for op, term, line_num in node.steps:
+            if isinstance(term, (Number, StringLiteral, BooleanLiteral)):
+                self.code.emit(ARITH_CONST, (op, term.value, line_num))
+            else:
+                self.expression(term)
+                self.code.emit(ARITH, (op, line_num))
+
+    def expr_VarLtConst(self, node):
+        variable = node.left
+        self.code.emit(VAR_LT_CONST, (variable.slot, variable.name, node.right.value, variable.line))
+
+    def expr_UnaryOp(self, node):
+        if node.op not in ('-', '+'):
+            self.code.emit(EVAL, node)
+            return
+        self.expression(node.expr)
+        if node.op == '-':
+            self.code.emit(UNARY_NEG)
+
+    def expr_IndexAccess(self, node):
+        self.expression(node.collection)
+        for index in node.index_expr:
+            self.expression(index)
+        self.code.emit(INDEX_LOAD, (len(node.index_expr), node.line))
+
+    def expr_ListLiteral(self, node):
+        if node._constant is not None:
+            self.code.emit(COPY_CONST, node._constant)
+            return
+        for elem in node.elements:
+            self.expression(elem)
+        self.code.emit(BUILD_LIST, len(node.elements))
+
+    def expr_TupleLiteral(self, node):
+        if node._constant is not None:
+            self.code.emit(LOAD_CONST, node._constant)
+            return
+        for elem in node.elements:
+            self.expression(elem)
+        self.code.emit(BUILD_TUPLE, len(node.elements))
+
+    def expr_DictLiteral(self, node):
+        if node._constant is not None:
+            self.code.emit(COPY_CONST, node._constant)
+            return
+        for key_node, value_node in node.pairs:
+            self.expression(key_node)
+            self.expression(value_node)
+        self.code.emit(BUILD_DICT, len(node.pairs))
+
+    def expr_SliceNode(self, node):
+        for part in (node.start, node.stop, node.step):
+            if part:
+                self.expression(part)
+            else:
+                self.code.emit(LOAD_CONST, None)
+        self.code.emit(BUILD_SLICE)
+
+def compile_loop(node):
+    """Compiles a while/for statement, returning None if it has to stay on the tree walker."""
+    try:
+        return Compiler().compile(node)
+    except Unsupported:
+        return None
+
+class VM:
+    """Executes compiled loops against the interpreter's evaluator scopes."""
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+
+    def execute(self, code):
+        """Runs a compiled loop; returns RETURN if a return statement inside it fired, or
+        a HotLoop once the loop has run enough iterations to be worth compiling further."""
+        e = self.interpreter.e
+        visit = self.interpreter.visit
+        frame = self.interpreter.frame
+        private = self.interpreter.frame_private
+        get_variable = e.get_variable
+        assign_variable = e.assign_variable
+        arithmetic = self.interpreter.arithmetic
+        ops = code.ops
+        args = code.args
+        end = len(ops)
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        iterators = []
+        pc = 0
+        # Scopes entered by FOR_SETUP that are still open; unwound if we leave early.
+        scopes = 0
+        loop_head = code.head
+        budget = code.budget
+        try:
+            while pc < end:
+                op = ops[pc]
+                arg = args[pc]
+                pc += 1
+                if op == LOAD_NAME:
+                    try:
+                        push(get_variable(arg[0]))
+                    except Exception as exc:
+                        raise Exception(f"Runtime Error on line {arg[1]}: {exc}")
+                elif op == LOAD_CONST:
+                    push(arg)
+                elif op == LOAD_SLOT:
+                    value = frame[arg[0]]
+                    if value is UNSET:
+                        try:
+                            value = get_variable(arg[1])
+                        except Exception as exc:
+                            raise Exception(f"Runtime Error on line {arg[2]}: {exc}")
+                    push(value)
+                elif op == STORE_SLOT:
+                    value = pop()
+                    frame[arg[0]] = value
+                    if not private:
+                        assign_variable(arg[1], value)
+                elif op == STORE_NAME:
+                    assign_variable(arg, pop())
+                elif op == ARITH:
+                    right = pop()
+                    try:
+                        stack[-1] = arithmetic[arg[0]](stack[-1], right)
+                    except Exception as exc:
+                        raise Exception(f"Runtime Error on line {arg[1]}: {exc}")
+                elif op == ARITH_CONST:
+                    try:
+                        stack[-1] = arithmetic[arg[0]](stack[-1], arg[1])
+                    except Exception as exc:
+                        raise Exception(f"Runtime Error on line {arg[2]}: {exc}")
+                elif op == COMPARE:
+                    right = pop()
+                    stack[-1] = arg(stack[-1], right)
+                elif op == COMPARE_CONST:
+                    stack[-1] = arg[0](stack[-1], arg[1])
+                elif op == INCREMENT:
+                    slot, name, operator_, delta, name_line, op_line = arg
+                    value = UNSET if slot is None else frame[slot]
+                    if value is UNSET:
+                        try:
+                            value = get_variable(name)
+                        except Exception as exc:
+                            raise Exception(f"Runtime Error on line {name_line}: {exc}")
+                    try:
+                        value = arithmetic[operator_](value, delta)
+                    except Exception as exc:
+                        raise Exception(f"Runtime Error on line {op_line}: {exc}")
+                    if slot is None:
+                        assign_variable(name, value)
+                    else:
+                        frame[slot] = value
+                        if not private:
+                            assign_variable(name, value)
+                elif op == VAR_LT_CONST:
+                    slot, name, constant, line_num = arg
+                    value = UNSET if slot is None else frame[slot]
+                    if value is UNSET:
+                        try:
+                            value = get_variable(name)
+                        except Exception as exc:
+                            raise Exception(f"Runtime Error on line {line_num}: {exc}")
+                    push(value < constant)
+                elif op == JUMP_IF_FALSE:
+                    if not pop():
+                        pc = arg
+                elif op == JUMP:
+                    if arg < pc:
+                        # Every backward jump ends an iteration of some loop
+                        budget -= 1
+                        if budget <= 0 and arg == loop_head:
+                            # Between iterations of the outermost loop nothing is left on the
+                            # stack, so the rest of the loop can run elsewhere; a for loop's
+                            # iterator and scope go with it.
+                            iterator = None
+                            if iterators:
+                                iterator = iterators.pop()
+                                scopes -= 1
+                            return HotLoop(iterator)
+                    pc = arg
+                elif op == FOR_ITER:
+                    try:
+                        push(next(iterators[-1]))
+                    except StopIteration:
+                        iterators.pop()
+                        pc = arg
+                elif op == POP_TOP:
+                    pop()
+                elif op == EVAL:
+                    push(visit(arg))
+                elif op == EXEC:
+                    if visit(arg) is RETURN:
+                        return RETURN
+                elif op == INDEX_LOAD:
+                    count, line_num = arg
+                    index = pop() if count == 1 else tuple(stack[-count:])
+                    if count != 1:
+                        del stack[-count:]
+                    try:
+                        stack[-1] = stack[-1][index]
+                    except (IndexError, KeyError, TypeError) as exc:
+                        raise Exception(f"Runtime Error on line {line_num}: {exc}")
+                elif op == INDEX_STORE:
+                    count, line_num = arg
+                    index = pop() if count == 1 else tuple(stack[-count:])
+                    if count != 1:
+                        del stack[-count:]
+                    value = pop()
+                    collection = pop()
+                    try:
+                        collection[index] = value
+                    except (IndexError, KeyError) as exc:
+                        raise Exception(f"Runtime Error on line {line_num}: {exc}")
+                elif op == CONTAINS:
+                    right = pop()
+                    if not isinstance(right, (list, str, dict, tuple)):
+                        raise Exception(f"Runtime Error on line {arg[1]}: The '{arg[0]}' operator can only be used with lists, strings, dictionaries, or tuples.")
+                    found = stack[-1] in right
+                    stack[-1] = found if arg[0] == 'in' else not found
+                elif op == UNARY_NEG:
+                    stack[-1] = -stack[-1]
+                elif op == BUILD_LIST:
+                    items = stack[len(stack) - arg:]
+                    del stack[len(stack) - arg:]
+                    push(items)
+                elif op == BUILD_TUPLE:
+                    items = tuple(stack[len(stack) - arg:])
+                    del stack[len(stack) - arg:]
+                    push(items)
+                elif op == BUILD_DICT:
+                    items = stack[len(stack) - 2 * arg:]
+                    del stack[len(stack) - 2 * arg:]
+                    py_dict = {}
+                    for i in range(0, len(items), 2):
+                        py_dict[items[i]] = items[i + 1]
+                    push(py_dict)
+                elif op == BUILD_SLICE:
+                    step = pop()
+                    stop = pop()
+                    stack[-1] = slice(stack[-1], stop, step)
+                elif op == PRINT:
+                    values = stack[len(stack) - arg:]
+                    del stack[len(stack) - arg:]
+                    print(*[('true' if value else 'false') if type(value) is bool else value for value in values])
+                elif op == FOR_SETUP:
+                    try:
+                        iterators.append(iter(pop()))
+                    except TypeError:
+                        raise Exception(f"Runtime Error on line {arg}: 'for' loop can only iterate over an iterable such as a list, string, tuple or range.")
+                    e.enter_scope()
+                    scopes += 1
+                elif op == COPY_CONST:
+                    push(arg.copy())
+                elif op == POP_ITER:
+                    iterators.pop()
+                elif op == EXIT_SCOPE:
+                    e.exit_scope()
+                    scopes -= 1
+                else:
+                    raise Exception(f"Unknown opcode {op}")
+        finally:
+            code.budget = budget
+            for _ in range(scopes):
+                e.exit_scope()
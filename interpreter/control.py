@@ -0,0 +1,28 @@
+# control.py
+
+class ControlFlow:
+    """A sentinel returned by statement visitors to unwind loops and function bodies."""
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f"<{self.name}>"
+
+BREAK = ControlFlow('break')
+CONTINUE = ControlFlow('continue')
+# The returned value itself is kept on the interpreter, in `_return_value`.
+RETURN = ControlFlow('return')
+
+class HotLoop:
+    """Returned by the loop VM when a loop gets hot, so the rest of it runs compiled to Python.
+    `iterator` is the live iterator of a for loop, whose scope is left open."""
+    __slots__ = ('iterator',)
+    def __init__(self, iterator):
+        self.iterator = iterator
+
+class TailCall:
+    """Carried in `_return_value` by `return f(...)` inside f, so the call reuses f's scope."""
+    __slots__ = ('args', 'kwargs')
+    def __init__(self, args, kwargs):
+        self.args = args
+        self.kwargs = kwargs
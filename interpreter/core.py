@@ -1,8 +1,23 @@
 import importlib
+import platform
+import sys
 from .parser import Parser
 from .lexer import tokenize
 from .ast_nodes import *
-from interpreter import mlscript 
+from .compiler import compile_loop, VM, COMPARE_OPS
+from .resolver import Resolver, UNSET, bound_names
+from .folder import ConstantFolder
+from .arithmetic import make_arithmetic
+from .control import BREAK, CONTINUE, RETURN, TailCall, HotLoop
+from .codegen import compile_numeric, compile_body, compile_hot_loop, JIT_WARMUP_CALLS
+try:
+    from interpreter import mlscript
+except ImportError:
+    # There is no compiled backend for PyPy, which runs without tensors. Elsewhere a
+    # missing or broken build is an error.
+    if platform.python_implementation() != 'PyPy':
+        raise
+    from . import evaluator as mlscript
 
 class C3_MRO:
     @staticmethod
@@ -20,25 +35,27 @@ class C3_MRO:
             return []
         
         result = []
-        # Make a copy of the lists to avoid modifying them in place
-        mro_list_copy = [list(mro) for mro in mro_list]
+        mros = [mro for mro in mro_list if mro]
+        # Instead of deleting heads, keep a cursor into each list
+        heads = [0] * len(mros)
+
+        # Count how many lists hold each class in their TAIL, so the "good head"
+        # check is a dict lookup instead of a scan over every other MRO.
+        tail_counts = {}
+        for mro in mros:
+            for cls in mro[1:]:
+                tail_counts[cls] = tail_counts.get(cls, 0) + 1
 
         while True:
-            # Filter out empty MROs from our copy
-            mro_list_copy = [mro for mro in mro_list_copy if mro]
-            if not mro_list_copy:
+            active = [i for i, mro in enumerate(mros) if heads[i] < len(mro)]
+            if not active:
                 break
 
             # Find a "good head" that does not appear in the TAIL of any other MRO
             good_head = None
-            for mro in mro_list_copy:
-                head = mro[0]
-                is_good_head = True
-                for other_mro in mro_list_copy:
-                    if head in other_mro[1:]:
-                        is_good_head = False
-                        break
-                if is_good_head:
+            for i in active:
+                head = mros[i][heads[i]]
+                if not tail_counts.get(head):
                     good_head = head
                     break
             
@@ -47,10 +64,13 @@ class C3_MRO:
 
             result.append(good_head)
 
-            # Remove the good head from the front of all lists in our copy
-            for mro in mro_list_copy:
-                if mro[0] == good_head:
-                    del mro[0]
+            # Advance past the good head in every list; each new head leaves its list's tail
+            for i in active:
+                mro = mros[i]
+                if mro[heads[i]] == good_head:
+                    heads[i] += 1
+                    if heads[i] < len(mro):
+                        tail_counts[mro[heads[i]]] -= 1
         
         return result
 
@@ -62,6 +82,11 @@ class MlscriptClass:
         self.methods = methods
         self.mro = C3_MRO.resolve(self)
 
+        # Flatten the MRO into one table; walking it in reverse lets earlier classes win.
+        self._method_table = {}
+        for cls in reversed(self.mro):
+            self._method_table.update({name: (method, cls) for name, method in cls.methods.items()})
+
     def __call__(self, interpreter, args, kwargs):
         instance = MlscriptInstance(self)
         initializer_tuple = self.find_method("init")
@@ -74,15 +99,13 @@ class MlscriptClass:
         return instance
 
     def find_method(self, name):
-        for cls in self.mro:
-            if name in cls.methods:
-                return (cls.methods[name], cls)
-        return None
+        return self._method_table.get(name)
 
     def __repr__(self):
         return f"<class '{self.name}'>"
 
 class MlscriptBoundMethod:
+    __slots__ = ('instance', 'func_def_node', 'defining_class')
     def __init__(self, instance, func_def_node, defining_class):
         self.instance = instance
         self.func_def_node = func_def_node
@@ -92,6 +115,7 @@ class MlscriptBoundMethod:
         return interpreter._call_function(self.func_def_node, args, kwargs,instance=self.instance, defining_class=self.defining_class)
     
 class MlscriptInstance:
+    __slots__ = ('klass', 'fields')
     def __init__(self,klass):
         self.klass = klass
         self.fields = {}
@@ -100,29 +124,18 @@ class MlscriptInstance:
         return f"<{self.klass.name} instance>"
     
 class ReturnSignal(Exception):
+    """Raised when a 'return' reaches the top level of a program."""
+    __slots__ = ('value',)
     def __init__(self, value):
         self.value = value
 
 class MlscriptThrow(Exception):
+    __slots__ = ('value',)
     def __init__(self, value):
         self.value = value
 
-class BreakSignal(Exception):
-    """Signal to break out of a loop."""
-    pass
-
-class ContinueSignal(Exception):
-    """Signal to continue to the next iteration of a loop."""
-    pass
-
-class MLObject:
-    def __init__(self, value):
-        self.value = value
-
-    def __repr__(self):
-        return str(self.value)
-
 class NoGradManager:
+    __slots__ = ('evaluator', 'original_state')
     def __init__(self, evaluator):
         self.evaluator = evaluator
         self.original_state = None
@@ -133,15 +146,37 @@ class NoGradManager:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.evaluator.set_grad_enabled(True)
 
+# Call kinds cached on FunctionCall nodes
+CALL_MLSCRIPT = 0  # MlscriptClass or MlscriptBoundMethod, called with the interpreter
+CALL_PYTHON = 1    # Any other Python callable
+
+# Builtins with no side effects on the interpreter, called directly while no program rebinds them
+PURE_BUILTINS = ('len', 'range', 'min', 'max', 'sum')
+
+def _node_classes():
+    """Yields every concrete AST node class, including nested subclasses."""
+    pending = list(Node.__subclasses__())
+    while pending:
+        node_class = pending.pop()
+        pending.extend(node_class.__subclasses__())
+        yield node_class
+
 class Interpreter:
+    __slots__ = ('mlscript', 'e', 'arithmetic', 'functions', 'method_context_stack', 'frame', 'frame_private',
+                 '_return_value', 'current_function', 'global_scope', 'builtins', '_dispatch', 'vm')
+
     def __init__(self):
         self.mlscript = mlscript
         self.e = mlscript.Evaluator()
+        self.arithmetic = make_arithmetic(self.e.evaluate)  # `+ - * /` by operator
         self.functions = {}
         self.method_context_stack = []
+        self.frame = None  # Local slots of the function call currently executing
+        self.frame_private = False  # Whether slotted locals skip the evaluator's scope
+        self._return_value = None  # Value carried by the RETURN sentinel
+        self.current_function = None  # FunctionDef of the plain (non-method) call executing
 
         self.global_scope = {
-            'tensor': mlscript.Tensor,
             'matmul': self.e.matmul,
             'len': len,
             'range': range,
@@ -149,53 +184,102 @@ class Interpreter:
             'max': max,
             'sum': sum,
             'no_grad': NoGradManager(self.e),
-            'Dense': mlscript.Dense,
-            'ReLU': mlscript.ReLU,
-            'Sigmoid': mlscript.Sigmoid,
-            'Flatten': mlscript.Flatten,
-            'MSELoss': mlscript.MSELoss,
-            'CrossEntropyLoss': mlscript.CrossEntropyLoss,
-            'SGD': mlscript.SGD,
-            'Adam': mlscript.Adam
         }
+        if hasattr(mlscript, 'Tensor'):
+            self.global_scope.update({
+                'tensor': mlscript.Tensor,
+                'Dense': mlscript.Dense,
+                'ReLU': mlscript.ReLU,
+                'Sigmoid': mlscript.Sigmoid,
+                'Flatten': mlscript.Flatten,
+                'MSELoss': mlscript.MSELoss,
+                'CrossEntropyLoss': mlscript.CrossEntropyLoss,
+                'SGD': mlscript.SGD,
+                'Adam': mlscript.Adam
+            })
         
         for name, value in self.global_scope.items():
             self.e.assign_variable(name, value)
+        # Builtins no program has rebound yet, which calls can reach without a scope lookup
+        self.builtins = {name: self.global_scope[name] for name in PURE_BUILTINS}
+
+        # visit() is a single dict lookup keyed by node class instead of an f-string
+        # plus getattr per node; the class-level table is only bound to this instance.
+        self._dispatch = {node_class: function.__get__(self)
+                          for node_class, function in self._visitor_table().items()}
+
+        self.vm = VM(self)
+
+    @classmethod
+    def _visitor_table(cls):
+        """Maps each node class to its visit_* function, resolved once per Interpreter class."""
+        if '_visitors' not in cls.__dict__:
+            cls._visitors = {}
+            for node_class in _node_classes():
+                visitor = getattr(cls, f'visit_{node_class.__name__}', None)
+                if visitor is not None:
+                    cls._visitors[node_class] = visitor
+        return cls._visitors
 
     def run(self, code):
+        self.execute(self.parse(code))
+
+    def parse(self, code):
+        """Tokenizes, parses, folds and resolves a program. The result can be executed more than once."""
         tokens = tokenize(code)
         statements = Parser(tokens,code).parse()
+        ConstantFolder(self.e.evaluate).fold_statements(statements)
+        Resolver().resolve(statements)
+        return statements
+
+    def execute(self, statements):
+        if self.builtins:
+            for stmt in statements:
+                for name in bound_names(stmt):
+                    self.builtins.pop(name, None)
         for stmt in statements:
-            self.visit(stmt)
+            if self.visit(stmt) is RETURN:
+                raise ReturnSignal(self._return_value)
 
     def visit(self, node):
-        if isinstance(node,NetworkLiteral):
-            return self.visit_NetworkLiteral(node)
-        method_name = f'visit_{type(node).__name__}'
-        visitor = getattr(self, method_name, self.no_visit_method)
+        try:
+            visitor = self._dispatch[type(node)]
+        except KeyError:
+            # A node class defined after the table was built (e.g. by an embedding)
+            visitor = getattr(self, f'visit_{type(node).__name__}', None)
+            if visitor is None:
+                return self.no_visit_method(node)
+            self._dispatch[type(node)] = visitor
         return visitor(node)
     
+    def _visitor_for(self, node):
+        """Returns the bound visit_* method for a node, or visit() itself if there is none."""
+        return self._dispatch.get(type(node), self.visit)
+
     def visit_IndexAssign(self, node):
         collection = self.visit(node.collection)
         value = self.visit(node.value_expr)
-        indices = [self.visit(expr) for expr in node.index_expr]
-        index = indices[0] if len(indices) == 1 else tuple(indices)
-
-        line_num = node.token[2]
-
+        index_expr = node.index_expr
+        if len(index_expr) == 1:
+            index = self.visit(index_expr[0])
+        else:
+            index = tuple([self.visit(expr) for expr in index_expr])
         try:
             collection[index] = value
         except (IndexError, KeyError) as e:
-            raise Exception(f"Runtime Error on line {line_num}: {e}")
+            raise Exception(f"Runtime Error on line {node.line}: {e}")
         
     def visit_IndexAccess(self, node):
         collection = self.visit(node.collection)
-        indices = [self.visit(expr) for expr in node.index_expr]
-        index = indices[0] if len(indices) == 1 else tuple(indices)
+        index_expr = node.index_expr
+        if len(index_expr) == 1:
+            index = self.visit(index_expr[0])
+        else:
+            index = tuple([self.visit(expr) for expr in index_expr])
         try:
             return collection[index]
         except (IndexError, KeyError, TypeError) as e:
-            line_num = node.token[2]
+            line_num = node.line
             raise Exception(f"Runtime Error on line {line_num}: {e}")
 
     def no_visit_method(self, node):
@@ -203,9 +287,25 @@ class Interpreter:
 
     def visit_Assign(self, node):
         value = self.visit(node.expr)
+        if node.left.slot is not None:
+            self.frame[node.left.slot] = value
+            if self.frame_private:
+                return
         self.e.assign_variable(node.left.name, value)
 
 
+    def visit_IncrementAssign(self, node):
+        value = self.visit_Variable(node.expr.left)
+        try:
+            value = self.arithmetic[node.op](value, node.delta)
+        except Exception as e:
+            raise Exception(f"Runtime Error on line {node.line}: {e}")
+        if node.left.slot is not None:
+            self.frame[node.left.slot] = value
+            if self.frame_private:
+                return
+        self.e.assign_variable(node.left.name, value)
+
     def visit_UnaryOp(self, node):
         value = self.visit(node.expr)
         if node.op == '-':
@@ -217,13 +317,19 @@ class Interpreter:
         return node.value
     
     def visit_ListLiteral(self, node):
-        return [self.visit(elem) for elem in node.elements]
+        if node._constant is not None:
+            return node._constant.copy()
+        visit = self.visit
+        return [visit(elem) for elem in node.elements]
     
     def visit_DictLiteral(self, node):
+        if node._constant is not None:
+            return node._constant.copy()
+        visit = self.visit
         py_dict = {}
         for key_node, value_node in node.pairs:
-            key = self.visit(key_node)
-            value = self.visit(value_node)
+            key = visit(key_node)
+            value = visit(value_node)
             py_dict[key] = value
         return py_dict
     
@@ -231,165 +337,323 @@ class Interpreter:
         return node.value
 
     def visit_PrintStatement(self, node):
+        visit = self.visit
         values = []
         for expr in node.exprs:
-            value = self.visit(expr)
-            if isinstance(value, bool):
-                values.append(str(value).lower())
+            value = visit(expr)
+            # bool can't be subclassed, so an exact type check is the same test as isinstance
+            if type(value) is bool:
+                values.append('true' if value else 'false')
             else:
                 values.append(value)
         
         print(*values)
 
     def visit_Block(self, node):
+        # Statements return None, or a BREAK/CONTINUE/RETURN sentinel that has to
+        # unwind to the enclosing loop or function call.
+        visitor_for = self._dispatch.get
+        visit = self.visit
         for statement in node.statements:
-            self.visit(statement)
+            flow = visitor_for(type(statement), visit)(statement)
+            if flow is BREAK or flow is CONTINUE or flow is RETURN:
+                return flow
 
     def visit_IfStatement(self, node):
         condition_value = self.visit(node.condition)
         if condition_value:
-            self.visit(node.if_block)
+            return self.visit(node.if_block)
         elif node.else_block:
-            self.visit(node.else_block)
+            return self.visit(node.else_block)
+
+    def _compiled(self, node):
+        """Returns the cached bytecode for a loop, compiling it on first use (False if it can't be)."""
+        code = node._bytecode
+        if code is None:
+            code = node._bytecode = compile_loop(node) or False
+        return code
+
+    def _run_loop(self, node, code):
+        """Runs a loop on the VM until it gets hot, and from then on as Python."""
+        hot_loop = node._hot_loop
+        if hot_loop is not None and hot_loop[0] is self:
+            return hot_loop[1](self.frame, self.frame_private, None)
+        flow = self.vm.execute(code)
+        if type(flow) is not HotLoop:
+            return flow
+        hot_loop = node._hot_loop = (self, compile_hot_loop(node, self))
+        return hot_loop[1](self.frame, self.frame_private, flow.iterator)
 
     def visit_WhileStatement(self, node):
-        while self.visit(node.condition):
-            try:
-                self.visit(node.body)
-            except BreakSignal:
+        code = self._compiled(node)
+        if code:
+            return self._run_loop(node, code)
+
+        # Both child node types are fixed, so bind their visitors once for the whole loop
+        condition, body = node.condition, node.body
+        visit_condition = self._visitor_for(condition)
+        visit_body = self._visitor_for(body)
+        while visit_condition(condition):
+            flow = visit_body(body)
+            if flow is BREAK:
                 break
-            except ContinueSignal:
-                continue
+            if flow is RETURN:
+                return flow
 
     def visit_ForStatement(self, node):
-        iterable_value = self.visit(node.iterable)
-        
-        iterator = None
-        if isinstance(iterable_value, (list, str,range,tuple)):
-            iterator = iterable_value
-        else:
-            line_num = node.iterable.token[2]
-            raise Exception(f"Runtime Error on line {line_num}: 'for' loop can only iterate over a list, string, tuple or range.")
+        code = self._compiled(node)
+        if code:
+            return self._run_loop(node, code)
 
+        iterable_value = self.visit(node.iterable)
+        try:
+            iterator = iter(iterable_value)
+        except TypeError:
+            line_num = node.iterable.line
+            raise Exception(f"Runtime Error on line {line_num}: 'for' loop can only iterate over an iterable such as a list, string, tuple or range.")
+
+        name, body = node.variable.name, node.body
+        assign_variable = self.e.assign_variable
+        visit_body = self._visitor_for(body)
         self.e.enter_scope()
-        for item in iterator:
-            self.e.assign_variable(node.variable.name, item)
-            try:
-                self.visit(node.body)
-            except BreakSignal:
-                break
-            except ContinueSignal:
-                continue
-        self.e.exit_scope()
+        try:
+            for item in iterator:
+                assign_variable(name, item)
+                flow = visit_body(body)
+                if flow is BREAK:
+                    break
+                if flow is RETURN:
+                    return flow
+        finally:
+            self.e.exit_scope()
 
     def visit_WithStatement(self,node):
-        context_manager = self.visit(node.context_expr)
+        return self._run_with(node, self.visit(node.context_expr))
+
+    def _run_with(self, node, context_manager):
         if not (hasattr(context_manager, '__enter__') and hasattr(context_manager, '__exit__')):
-            line_num = node.context_expr.token[2]
+            line_num = node.context_expr.line
             raise Exception(f"Runtime Error on line {line_num}: 'with' statement requires a context manager.")
         context_manager.__enter__()
         try:
-            self.visit(node.body)
+            return self.visit(node.body)
         finally:
             context_manager.__exit__(None, None, None)
 
+    def visit_NoGradBlock(self, node):
+        context_manager = self.visit(node.context_expr)
+        if type(context_manager) is not NoGradManager:
+            # 'no_grad' has been rebound to something else
+            return self._run_with(node, context_manager)
+        e = self.e
+        e.set_grad_enabled(False)
+        try:
+            return self.visit(node.body)
+        finally:
+            e.set_grad_enabled(True)
+
     def visit_FunctionDef(self, node):
         self.functions[node.name] = node
 
     def visit_ReturnStatement(self, node):
-        value = self.visit(node.expr)
-        raise ReturnSignal(value)
+        if node.tail_call and self.current_function is not None:
+            if self.functions.get(node.expr._callee_name) is self.current_function:
+                return self._tail_call(node.expr)
+        self._return_value = self.visit(node.expr)
+        return RETURN
+
+    def _tail_call(self, node):
+        """Hands `return f(...)` inside f back to _call_function, which reruns f in the same scope."""
+        args = [self.visit(arg) for arg in node.args]
+        kwargs = {key: self.visit(value) for key, value in node.kwargs.items()}
+        func_def = self.functions[node._callee_name]
+        if func_def is self.current_function:
+            self._return_value = TailCall(args, kwargs)
+        else:
+            # Evaluating the arguments redefined the function, so make an ordinary call
+            self._return_value = self._call_function(func_def, args, kwargs)
+        return RETURN
 
     def visit_Number(self, node):
         return node.value
 
     def visit_Variable(self, node):
+        if node.slot is not None:
+            value = self.frame[node.slot]
+            if value is not UNSET:
+                return value
         try:
             return self.e.get_variable(node.name)
         except Exception as e:
-            line_num = node.token[2] 
+            line_num = node.line 
             raise Exception(f"Runtime Error on line {line_num}: {e}")
         
-    def visit_AttributeAccess(self, node):
-        obj = self.visit(node.obj)
-        attribute_name = node.attribute
-
-        if isinstance(obj, MlscriptInstance):
-            if attribute_name in obj.fields:
-                return obj.fields[attribute_name]
-            
-            method_node = obj.klass.find_method(attribute_name)
-            if method_node:
-                return MlscriptBoundMethod(obj, method_node)
-            
-            line_num = node.token[2]
-            raise Exception(f"Runtime Error on line {line_num}: Object of type '{obj.klass.name}' has no attribute or method '{attribute_name}'")
-        
-        try:
-            return getattr(obj, node.attribute)
-        except AttributeError:
-            line_num = node.token[2]
-            raise Exception(f"Runtime Error on line {line_num}: Object '{obj}' has no attribute '{node.attribute}'") 
-
     def visit_BinOp(self, node):
         left = self.visit(node.left)
         right = self.visit(node.right)
         
-        op = node.op_token[1]
-        line_num = node.op_token[2]
+        op = node.op
 
         if op in ('+', '-', '*', '/'):
             try:
-                return self.e.evaluate(op, left, right)
+                return self.arithmetic[op](left, right)
             except Exception as e:
-                raise Exception(f"Runtime Error on line {line_num}: {e}")
-        elif op == '==': return left == right
-        elif op == '!=': return left != right
-        elif op == '<':  return left < right
-        elif op == '<=': return left <= right
-        elif op == '>':  return left > right
-        elif op == '>=': return left >= right
+                raise Exception(f"Runtime Error on line {node.line}: {e}")
+        elif op in COMPARE_OPS:
+            return COMPARE_OPS[op](left, right)
         elif op == 'in':
             if isinstance(right, (list, str, dict, tuple)):
                 return left in right
             else:
-                raise Exception(f"Runtime Error on line {line_num}: The 'in' operator can only be used with lists, strings, dictionaries, or tuples.")
+                raise Exception(f"Runtime Error on line {node.line}: The 'in' operator can only be used with lists, strings, dictionaries, or tuples.")
         elif op == 'not in':
             if isinstance(right, (list, str, dict, tuple)):
                 return left not in right
             else:
-                raise Exception(f"Runtime Error on line {line_num}: The 'not in' operator can only be used with lists, strings, dictionaries, or tuples.")
+                raise Exception(f"Runtime Error on line {node.line}: The 'not in' operator can only be used with lists, strings, dictionaries, or tuples.")
         else:
-            raise Exception(f"Unsupported binary operator: {op} on line: {line_num}" )
+            raise Exception(f"Unsupported binary operator: {op} on line: {node.line}" )
 
-    def visit_FunctionCall(self, node):
-        line_num = node.token[2]
-        args = [self.visit(arg) for arg in node.args]
-        kwargs = {key: self.visit(value) for key,value in node.kwargs.items()}
+    def _arithmetic(self, op, node):
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        try:
+            return self.arithmetic[op](left, right)
+        except Exception as e:
+            raise Exception(f"Runtime Error on line {node.line}: {e}")
+
+    def visit_ArithChain(self, node):
+        visit = self.visit
+        arithmetic = self.arithmetic
+        value = visit(node.first)
+        for op, term, line_num in node.steps:
+            right = visit(term)
+            try:
+                value = arithmetic[op](value, right)
+            except Exception as e:
+                raise Exception(f"Runtime Error on line {line_num}: {e}")
+        return value
 
-        if isinstance(node.callee, Variable) and node.callee.name in self.functions:
-            func_def = self.functions[node.callee.name]
-            return self._call_function(func_def, args, kwargs)
+    def visit_AddOp(self, node):
+        return self._arithmetic('+', node)
 
-        callee_obj = self.visit(node.callee)
+    def visit_SubOp(self, node):
+        return self._arithmetic('-', node)
 
-        if isinstance(callee_obj, MlscriptClass):
-            return callee_obj(self, args, kwargs)
-        
-        if isinstance(callee_obj, MlscriptBoundMethod):
+    def visit_MulOp(self, node):
+        return self._arithmetic('*', node)
+
+    def visit_DivOp(self, node):
+        return self._arithmetic('/', node)
+
+    def visit_EqOp(self, node):
+        return self.visit(node.left) == self.visit(node.right)
+
+    def visit_NeOp(self, node):
+        return self.visit(node.left) != self.visit(node.right)
+
+    def visit_LtOp(self, node):
+        return self.visit(node.left) < self.visit(node.right)
+
+    def visit_VarLtConst(self, node):
+        return self.visit_Variable(node.left) < node.right.value
+
+    def visit_LteOp(self, node):
+        return self.visit(node.left) <= self.visit(node.right)
+
+    def visit_GtOp(self, node):
+        return self.visit(node.left) > self.visit(node.right)
+
+    def visit_GteOp(self, node):
+        return self.visit(node.left) >= self.visit(node.right)
+
+    def visit_InOp(self, node):
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        if node.container_literal or isinstance(right, (list, str, dict, tuple)):
+            return left in right
+        raise Exception(f"Runtime Error on line {node.line}: The 'in' operator can only be used with lists, strings, dictionaries, or tuples.")
+
+    def visit_NotInOp(self, node):
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        if node.container_literal or isinstance(right, (list, str, dict, tuple)):
+            return left not in right
+        raise Exception(f"Runtime Error on line {node.line}: The 'not in' operator can only be used with lists, strings, dictionaries, or tuples.")
+
+    def visit_FunctionCall(self, node):
+        visit = self.visit
+        args = node._constant_args
+        if args is None:
+            # Most calls pass one or two arguments, which are cheaper to visit unrolled
+            arg_nodes = node.args
+            count = len(arg_nodes)
+            if count == 1:
+                args = [visit(arg_nodes[0])]
+            elif count == 2:
+                args = [visit(arg_nodes[0]), visit(arg_nodes[1])]
+            else:
+                args = [visit(arg) for arg in arg_nodes]
+        kwargs = {key: visit(value) for key, value in node.kwargs.items()} if node.kwargs else {}
+
+        if node._callee_name is not None:
+            func_def = self.functions.get(node._callee_name)
+            if func_def is not None:
+                return self._call_function(func_def, args, kwargs)
+            builtin = self.builtins.get(node._callee_name)
+            if builtin is not None:
+                try:
+                    return builtin(*args, **kwargs)
+                except Exception as e:
+                    raise Exception(f"Runtime Error on line {node.line}: Error during function call: {e}") from e
+
+        callee = node.callee
+        if type(callee) is AttributeAccess:
+            obj = visit(callee.obj)
+            if type(obj) is MlscriptInstance and callee.attribute not in obj.fields:
+                # `obj.method(...)` runs the method without allocating a bound method for it
+                klass = obj.klass
+                if callee._cached_class is klass:
+                    method_tuple = callee._cached_result
+                else:
+                    method_tuple = self._lookup_method(callee, klass)
+                if method_tuple:
+                    method_node, defining_class = method_tuple
+                    return self._call_function(method_node, args, kwargs, instance=obj, defining_class=defining_class)
+            callee_obj = self._attribute(callee, obj)
+        else:
+            callee_obj = visit(callee)
+
+        # How an object gets called depends only on its type, so the isinstance
+        # chain runs once per call site until a different type shows up there.
+        callee_type = type(callee_obj)
+        if callee_type is node._cached_type:
+            call_kind = node._call_kind
+        else:
+            call_kind = self._call_kind_of(node, callee_obj)
+            node._cached_type = callee_type
+            node._call_kind = call_kind
+
+        if call_kind == CALL_MLSCRIPT:
             return callee_obj(self, args, kwargs)
+
+        try:
+            return callee_obj(*args, **kwargs)
+        except Exception as e:
+            raise Exception(f"Runtime Error on line {node.line}: Error during function call: {e}") from e
+
+    def _call_kind_of(self, node, callee_obj):
+        if isinstance(callee_obj, (MlscriptClass, MlscriptBoundMethod)):
+            return CALL_MLSCRIPT
         
         if isinstance(callee_obj, NoGradManager):
-            raise Exception(f"Runtime Error on line {line_num}: 'no_grad' must be used in a 'with' statement, not called as a function.")
+            raise Exception(f"Runtime Error on line {node.line}: 'no_grad' must be used in a 'with' statement, not called as a function.")
 
         if not callable(callee_obj):
             callee_repr = node.callee.name if isinstance(node.callee, Variable) else 'expression'
-            raise Exception(f"Runtime Error on line {line_num}: '{callee_repr}' is not a function.")
+            raise Exception(f"Runtime Error on line {node.line}: '{callee_repr}' is not a function.")
 
-        try:
-            return callee_obj(*args, **kwargs)
-        except Exception as e:
-            raise Exception(f"Runtime Error on line {line_num}: Error during function call: {e}")
+        return CALL_PYTHON
         
     def visit_SliceNode(self, node):
         start = self.visit(node.start) if node.start else None
@@ -399,17 +663,18 @@ class Interpreter:
     
     def visit_ImportStatement(self, node):
         try:
-            module = importlib.import_module(node.module_name)
+            # An already imported module skips the import machinery and its lock
+            module = sys.modules.get(node.module_name) or importlib.import_module(node.module_name)
             self.e.assign_variable(node.alias, module)
         except ImportError as e:
-            line_num = node.token[2]
+            line_num = node.line
             raise Exception(f"Runtime Error on line {line_num}: {e}")
         
     def visit_TupleLiteral(self, node):
-        elements =[]
-        for elem in node.elements:
-            elements.append(self.visit(elem))
-        return tuple(elements)
+        if node._constant is not None:
+            return node._constant
+        visit = self.visit
+        return tuple([visit(elem) for elem in node.elements])
     
     def visit_ThrowStatement(self, node):
         value_to_throw = self.visit(node.expr)
@@ -418,78 +683,110 @@ class Interpreter:
     def visit_TryCatch(self, node):
         try:
             try:
-                self.visit(node.try_block)
+                flow = self.visit(node.try_block)
             except MlscriptThrow as e:
                 if node.catch_block:
                     self.e.enter_scope()
-                    # Assign the caught error to the specified variable
-                    self.e.assign_variable(node.catch_variable.name, e.value)
-                    self.visit(node.catch_block)
-                    self.e.exit_scope()
+                    try:
+                        # Assign the caught error to the specified variable
+                        self.e.assign_variable(node.catch_variable.name, e.value)
+                        flow = self.visit(node.catch_block)
+                    finally:
+                        self.e.exit_scope()
                 else:
                     # If there's no catch block, the error continues up
                     raise e
-        finally:
-            # The finally block runs no matter what
+        except BaseException:
+            # The finally block runs no matter what; a break/continue/return
+            # inside it replaces the error that is propagating.
             if node.finally_block:
-                self.visit(node.finally_block)
+                finally_flow = self.visit(node.finally_block)
+                if finally_flow is not None:
+                    return finally_flow
+            raise
+
+        if node.finally_block:
+            # Calls made by the finally block may overwrite a pending return value
+            return_value = self._return_value
+            finally_flow = self.visit(node.finally_block)
+            if finally_flow is not None:
+                return finally_flow
+            self._return_value = return_value
+        return flow
 
     def visit_BreakStatement(self, node):
-        raise BreakSignal()
+        return BREAK
     
     def visit_ContinueStatement(self, node):
-        raise ContinueSignal()
+        return CONTINUE
     
     def visit_ClassDef(self,node):
         parents = []
         for parent_node in node.parents:
             parent_obj = self.visit(parent_node)
             if not isinstance(parent_obj, MlscriptClass):
-                line_num = node.parent.token[2]
+                line_num = parent_node.line
                 raise Exception(f"Runtime Error on line {line_num}: 'inherits' must be followed by a class name.")
             parents.append(parent_obj)
 
         class_name = node.name
-        methods = {method.name: method for method in node.methods}
-        klass = MlscriptClass(class_name,parents, methods)
+        klass = MlscriptClass(class_name,parents, node._methods_by_name)
         self.e.assign_variable(class_name,klass)
         return None
     
     def visit_AttributeAccess(self, node):
-        obj = self.visit(node.obj)
+        return self._attribute(node, self.visit(node.obj))
+
+    def _attribute(self, node, obj):
         attribute_name = node.attribute
-        
+
+        if type(obj) is MlscriptInstance:
+            fields = obj.fields
+            if attribute_name in fields:
+                return fields[attribute_name]
+
+            klass = obj.klass
+            if node._cached_class is klass:
+                method_tuple = node._cached_result
+            else:
+                method_tuple = self._lookup_method(node, klass)
+            if method_tuple:
+                method_node, defining_class = method_tuple
+                return MlscriptBoundMethod(obj, method_node, defining_class)
+
+            line_num = node.line
+            raise Exception(f"Runtime Error on line {line_num}: Object of type '{klass.name}' has no attribute or method '{attribute_name}'")
+
         if isinstance(obj, tuple) and len(obj) == 2 and isinstance(obj[1], MlscriptClass):
+            # `super.name`: the SuperNode evaluates to (instance, class to start the search from)
             instance, search_start_class = obj
-            method_tuple = search_start_class.find_method(attribute_name)
+            if node._cached_class is search_start_class:
+                method_tuple = node._cached_result
+            else:
+                method_tuple = self._lookup_method(node, search_start_class)
             if not method_tuple:
-                line_num = node.token[2]
+                line_num = node.line
                 raise Exception(f"Runtime Error on line {line_num}: No method '{attribute_name}' found in superclass chain.")
-            
+
             method_node, defining_class = method_tuple
             return MlscriptBoundMethod(instance, method_node, defining_class)
 
-        if isinstance(obj, MlscriptInstance):
-            if attribute_name in obj.fields:
-                return obj.fields[attribute_name]
-            
-            method_tuple = obj.klass.find_method(attribute_name)
-            if method_tuple:
-                method_node, defining_class = method_tuple
-                return MlscriptBoundMethod(obj, method_node, defining_class)
-            
-            line_num = node.token[2]
-            raise Exception(f"Runtime Error on line {line_num}: Object of type '{obj.klass.name}' has no attribute or method '{attribute_name}'")
-
         try:
             return getattr(obj, attribute_name)
         except AttributeError:
-            line_num = node.token[2]
+            line_num = node.line
             raise Exception(f"Runtime Error on line {line_num}: Object '{obj}' has no attribute '{attribute_name}'")
-        
+
+    def _lookup_method(self, node, klass):
+        """Finds a method through the class's MRO and caches the result on the access node."""
+        method_tuple = klass.find_method(node.attribute)
+        node._cached_class = klass
+        node._cached_result = method_tuple
+        return method_tuple
+
     def visit_SuperNode(self, node):
         if not self.method_context_stack:
-            line_num = node.token[2]
+            line_num = node.line
             raise Exception(f"Runtime Error on line {line_num}: 'super' can only be used inside a class method.")
 
         instance, defining_class = self.method_context_stack[-1]
@@ -500,13 +797,13 @@ class Interpreter:
             search_start_class = instance_mro[idx + 1]
             return (instance, search_start_class)
         except (ValueError, IndexError):
-            line_num = node.token[2]
+            line_num = node.line
             raise Exception(f"Runtime Error on line {line_num}: 'super' could not find a valid superclass in the MRO for class '{defining_class.name}'.")
         
     def visit_AttributeAssign(self, node):
         obj = self.visit(node.obj)
         if not isinstance(obj, MlscriptInstance):
-            line_num = node.token[2]
+            line_num = node.line
             raise Exception(f"Runtime Error on line {line_num}: Cannot assign attribute '{node.attribute}' to non-instance object '{obj}'.")
         
         value = self.visit(node.value_expr)
@@ -514,22 +811,94 @@ class Interpreter:
         return value
     
     def _call_function(self, func_def, args, kwargs, instance=None, defining_class=None):
-        params = list(func_def.params)
-        param_names = [p[0].name for p in params]
+        native = func_def._native
+        if native is not False and instance is None and not kwargs:
+            if native is None:
+                func_def.calls += 1
+                if func_def.calls > JIT_WARMUP_CALLS:
+                    native = func_def._native = compile_numeric(func_def) or False
+            if (native and len(args) == len(func_def.param_names) and all(type(arg) is float for arg in args)
+                    and (not func_def._native_uses_range or self._range_is_builtin())):
+                try:
+                    return native(*args)
+                except ArithmeticError:
+                    # e.g. a division by zero, which the evaluator turns into inf/nan;
+                    # the body is side-effect free, so just rerun it on the tree walker.
+                    pass
+
+        final_args = self._match_arguments(func_def, args, kwargs, instance)
+
+        if instance:
+            self.method_context_stack.append((instance, defining_class))
+
+        caller_frame = self.frame
+        caller_private = self.frame_private
+        caller_function = self.current_function
+        private = func_def.private_frame
+        body = self._compiled_body(func_def)
+        needs_scope = func_def.needs_scope
+        if needs_scope:
+            self.e.enter_scope()
+        try:
+            while True:
+                frame = [UNSET] * func_def.frame_size
+                self._bind_parameters(func_def, final_args, frame, private)
+                self.frame = frame
+                self.frame_private = private
+                self.current_function = None if instance else func_def
+                if body(frame) is not RETURN:
+                    return None
+                value = self._return_value
+                # Don't keep the returned object alive once the caller has it
+                self._return_value = None
+                if type(value) is not TailCall:
+                    return value
+                # The caller's scope would be dropped as soon as the call returns, so
+                # rebind the parameters in it and run the body again instead of nesting.
+                final_args = self._match_arguments(func_def, value.args, value.kwargs, None)
+        finally:
+            self.frame = caller_frame
+            self.frame_private = caller_private
+            self.current_function = caller_function
+            if needs_scope:
+                self.e.exit_scope()
+            if instance:
+                self.method_context_stack.pop()
+
+    def _range_is_builtin(self):
+        """True if a call to `range` would still reach the builtin, as native loops assume."""
+        if 'range' in self.functions:
+            return False
+        try:
+            return self.e.get_variable('range') is range
+        except Exception:
+            return False
+
+    def _compiled_body(self, func_def):
+        """Returns the function's body compiled to Python for this interpreter, compiling it on first use."""
+        compiled = func_def._compiled_body
+        if compiled is None or compiled[0] is not self:
+            compiled = func_def._compiled_body = (self, compile_body(func_def, self))
+        return compiled[1]
+
+    def _match_arguments(self, func_def, args, kwargs, instance):
+        """Maps parameter names to the values passed for them (defaults are filled in later)."""
+        param_names = func_def.param_names
+        num_params = len(param_names)
         final_args = {}
 
         # 1. Handle instance 'self' - it's a special positional argument
+        first = 0
         if instance:
             if not param_names:
                 raise Exception(f"Error: Method '{func_def.name}' has no 'self' parameter.")
             final_args[param_names[0]] = instance
-            # Remove 'self' from the list of params to match against
-            param_names.pop(0) 
-            params.pop(0)
+            # Match the remaining arguments against the params after 'self'
+            first = 1
 
         # 2. Match positional args to remaining params
-        for i, arg_value in enumerate(args):
-            if i >= len(param_names):
+        for i, arg_value in enumerate(args, first):
+            if i >= num_params:
                 raise Exception(f"Error: Function '{func_def.name}' received too many positional arguments.")
             param_name = param_names[i]
             if param_name in kwargs:
@@ -538,39 +907,31 @@ class Interpreter:
         
         # 3. Handle keyword arguments
         for key, value in kwargs.items():
-            if key not in param_names:
+            if key not in param_names or (first and key == param_names[0]):
                 raise Exception(f"Error: Function '{func_def.name}' got an unexpected keyword argument '{key}'")
             if key in final_args:
                 raise Exception(f"Error: Function '{func_def.name}' got multiple values for argument '{key}'")
             final_args[key] = value
-
-        if instance:
-            self.method_context_stack.append((instance, defining_class))
-
-        self.e.enter_scope()
-        try:
-            for param_node, default_node in params:
-                param_name = param_node.name
-                if param_name in final_args:
-                    self.e.assign_variable(param_name, final_args[param_name])
-                elif default_node is not None:
-                    default_value = self.visit(default_node)
-                    self.e.assign_variable(param_name, default_value)
-                elif instance and param_name == param_names[0]:
-                    continue # Skip 'self' if it wasn't provided
-                else:
-                    raise Exception(f"Error: Function '{func_def.name}' missing required argument: '{param_name}'")
-
-            return self.visit(func_def.body)
-
-        except ReturnSignal as ret:
-            return ret.value
-        finally:
-            self.e.exit_scope()
-            if instance:
-                self.method_context_stack.pop()
-
-        return None
+        return final_args
+
+    def _bind_parameters(self, func_def, final_args, frame, private):
+        """Assigns every parameter in the current scope and frame, evaluating missing defaults."""
+        constant_defaults = func_def.constant_defaults
+        assign_variable = self.e.assign_variable
+        for param_name, slot, default_node in zip(func_def.param_names, func_def.param_slots, func_def.param_defaults):
+            if param_name in final_args:
+                value = final_args[param_name]
+            elif param_name in constant_defaults:
+                value = constant_defaults[param_name]
+            elif default_node is not None:
+                value = self.visit(default_node)
+            else:
+                raise Exception(f"Error: Function '{func_def.name}' missing required argument: '{param_name}'")
+            if slot is not None:
+                frame[slot] = value
+                if private:
+                    continue
+            assign_variable(param_name, value)
     
     def visit_NetworkLiteral(self,node):
         attrs = node.attributes
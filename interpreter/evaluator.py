@@ -0,0 +1,99 @@
+# evaluator.py
+import math
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .arithmetic import INT_MIN, INT_MAX
+
+DUNDERS = {'+': '__add__', '-': '__sub__', '*': '__mul__', '/': '__truediv__'}
+
+_grad_enabled = True
+
+class Evaluator:
+    """Pure-Python stand-in for the C++ `mlscript.Evaluator`, used when the compiled
+    backend can't be loaded (for example under PyPy, where the interpreter's own loops
+    are then traced by the JIT instead of calling into C++ per operation).
+
+    Scopes and scalar, string and numpy arithmetic behave as in the backend, down to
+    32-bit int wrapping and the error messages. Tensors need the backend.
+    """
+    __slots__ = ('scope_stack',)
+
+    def __init__(self):
+        self.scope_stack = [{}]
+
+    def enter_scope(self):
+        self.scope_stack.append({})
+
+    def exit_scope(self):
+        if len(self.scope_stack) > 1:
+            self.scope_stack.pop()
+        else:
+            raise RuntimeError("Internal error: Cannot exit the global scope.")
+
+    def assign_variable(self, name, value):
+        self.scope_stack[-1][name] = value
+
+    def set_grad_enabled(self, enabled):
+        global _grad_enabled
+        _grad_enabled = enabled
+
+    def get_variable(self, name):
+        for scope in reversed(self.scope_stack):
+            if name in scope:
+                return scope[name]
+        raise RuntimeError(f"Undefined variable: {name}")
+
+    def evaluate(self, op, left, right):
+        left_array = numpy is not None and isinstance(left, numpy.ndarray)
+        right_array = numpy is not None and isinstance(right, numpy.ndarray)
+        left_numeric = isinstance(left, (float, int))
+        right_numeric = isinstance(right, (float, int))
+
+        dunder = DUNDERS.get(op)
+        if dunder:
+            if left_array and right_numeric:
+                return getattr(left, dunder)(right)
+            if left_numeric and right_array:
+                return getattr(right, '__r' + dunder[2:])(left)
+
+            if left_numeric and right_numeric and (isinstance(left, float) or isinstance(right, float)):
+                return _binary(op, float(left), float(right))
+            if isinstance(left, int) and isinstance(right, int):
+                left, right = _c_int(left), _c_int(right)
+                if op == '/':
+                    return _binary(op, float(left), float(right))
+                return _wrap(_binary(op, left, right))
+            if isinstance(left, str) and isinstance(right, str) and op == '+':
+                return left + right
+
+        raise RuntimeError(f"Unsupported types for operator {op}: "
+                           f"'{type(left).__name__}' and '{type(right).__name__}'")
+
+    def matmul(self, left, right):
+        raise RuntimeError("matmul is only defined for Tensors.")
+
+def _c_int(value):
+    if not INT_MIN <= value <= INT_MAX:
+        raise RuntimeError("Unable to cast Python instance of type <class 'int'> to C++ type 'int'")
+    return int(value)
+
+def _wrap(value):
+    return (value - INT_MIN) % 2 ** 32 + INT_MIN
+
+def _binary(op, left, right):
+    if op == '+':
+        return left + right
+    if op == '-':
+        return left - right
+    if op == '*':
+        return left * right
+    if right == 0:
+        # IEEE division, which Python raises on instead
+        if left == 0 or math.isnan(left):
+            return math.nan
+        return math.copysign(math.inf, left) * math.copysign(1.0, right)
+    return left / right
@@ -0,0 +1,105 @@
+# folder.py
+from .ast_nodes import *
+
+ARITHMETIC_NODES = (AddOp, SubOp, MulOp, DivOp)
+COMPARISONS = {
+    EqOp: lambda a, b: a == b, NeOp: lambda a, b: a != b,
+    LtOp: lambda a, b: a < b, LteOp: lambda a, b: a <= b,
+    GtOp: lambda a, b: a > b, GteOp: lambda a, b: a >= b,
+}
+LITERALS = (Number, StringLiteral, BooleanLiteral)
+
+class ConstantFolder:
+    """Folds operations on literals into literals and drops `if` branches that can never run.
+    Left-nested arithmetic that is left over is flattened into ArithChain nodes, and list,
+    tuple and dict literals made only of literals get their value prebuilt in `_constant`.
+
+    Arithmetic is folded with the evaluator's own `evaluate`, so the result wraps or
+    promotes exactly as it would at run time. Anything that raises is left in the tree
+    so the error still surfaces, with its line number, when the code actually runs.
+    """
+    def __init__(self, evaluate):
+        self.evaluate = evaluate
+
+    def fold_statements(self, statements):
+        statements[:] = [self.fold(stmt) for stmt in statements]
+        return statements
+
+    def fold(self, node):
+        for name in node_fields(type(node)):
+            value = getattr(node, name, None)
+            if isinstance(value, (Node, list, tuple, dict)):
+                setattr(node, name, self._fold_value(value))
+
+        if isinstance(node, UnaryOp):
+            if node.op in ('-', '+') and isinstance(node.expr, Number):
+                return self._literal(Number, -node.expr.value if node.op == '-' else node.expr.value, node.line)
+        elif isinstance(node, ARITHMETIC_NODES):
+            if isinstance(node.left, (Number, StringLiteral)) and isinstance(node.right, (Number, StringLiteral)):
+                try:
+                    return self._result(self.evaluate(node.op, node.left.value, node.right.value), node)
+                except Exception:
+                    return node
+            if isinstance(node.left, ARITHMETIC_NODES + (ArithChain,)):
+                return self._chain(node)
+        elif type(node) in COMPARISONS:
+            if isinstance(node.left, LITERALS) and isinstance(node.right, LITERALS):
+                try:
+                    return self._result(COMPARISONS[type(node)](node.left.value, node.right.value), node)
+                except Exception:
+                    return node
+            # Folding the right operand may have turned `i < 10 * 10` into the fused loop test
+            if type(node) is LtOp:
+                return make_binop(node.left, (None, node.op, node.line), node.right)
+        elif type(node) is Assign:
+            return make_assign(node.left, node.expr)
+        elif isinstance(node, (ListLiteral, TupleLiteral)):
+            if all(isinstance(elem, LITERALS) for elem in node.elements):
+                values = [elem.value for elem in node.elements]
+                node._constant = values if isinstance(node, ListLiteral) else tuple(values)
+        elif isinstance(node, DictLiteral):
+            if all(isinstance(key, LITERALS) and isinstance(value, LITERALS) for key, value in node.pairs):
+                node._constant = {key.value: value.value for key, value in node.pairs}
+        elif isinstance(node, FunctionCall):
+            if node.args and all(isinstance(arg, LITERALS) for arg in node.args):
+                node._constant_args = tuple(arg.value for arg in node.args)
+        elif isinstance(node, FunctionDef):
+            # Defaults such as `step=-1` only become literals now
+            node.constant_defaults = literal_defaults(node.param_names, node.param_defaults)
+        elif isinstance(node, IfStatement) and isinstance(node.condition, LITERALS):
+            if node.condition.value:
+                return node.if_block
+            return node.else_block or Block([])
+        return node
+
+    def _chain(self, node):
+        """Flattens `(left-nested arithmetic) op right` into a single ArithChain."""
+        left = node.left
+        if isinstance(left, ArithChain):
+            first, steps = left.first, left.steps
+        else:
+            first, steps = left.left, [(left.op, left.right, left.line)]
+        return ArithChain(first, steps + [(node.op, node.right, node.line)])
+
+    def _fold_value(self, value):
+        if isinstance(value, Node):
+            return self.fold(value)
+        if isinstance(value, list):
+            return [self._fold_value(item) for item in value]
+        if isinstance(value, tuple):
+            return tuple(self._fold_value(item) for item in value)
+        if isinstance(value, dict):
+            return {key: self._fold_value(item) for key, item in value.items()}
+        return value
+
+    def _result(self, value, node):
+        if type(value) is bool:
+            return self._literal(BooleanLiteral, value, node.line)
+        if type(value) in (int, float):
+            return self._literal(Number, value, node.line)
+        if type(value) is str:
+            return self._literal(StringLiteral, value, node.line)
+        return node
+
+    def _literal(self, node_class, value, line):
+        return node_class((None, value, line))
@@ -1,4 +1,5 @@
 import re
+import sys
 from enum import Enum, auto
 
 class TokenType(Enum):
@@ -57,31 +58,6 @@ token_spec = [
     ("COMMENT",       r'//.*'),
     ("NEWLINE",        r'\n'),
     ("SKIP",            r'[ \t]+'),
-    (TokenType.IF,      r'if\b'),
-    (TokenType.ELIF,    r'elif\b'),
-    (TokenType.ELSE,    r'else\b'),
-    (TokenType.WHILE,   r'while\b'),
-    (TokenType.FOR,     r'for\b'),
-    (TokenType.NOT,     r'not\b'),
-    (TokenType.IN,      r'in\b'),
-    (TokenType.WITH,    r'with\b'),
-    (TokenType.TRY,     r'try\b'),
-    (TokenType.CATCH,   r'catch\b'),
-    (TokenType.FINALLY, r'finally\b'),
-    (TokenType.THROW,   r'throw\b'),
-    (TokenType.BREAK,   r'break\b'),
-    (TokenType.CONTINUE, r'continue\b'),
-    (TokenType.FUN,     r'fun\b'),
-    (TokenType.CLASS,   r'class\b'),
-    (TokenType.SUPER,   r'super\b'),
-    (TokenType.INHERITS, r'inherits\b'),
-    (TokenType.RETURN,  r'return\b'),
-    (TokenType.PRINT,   r'print\b'),
-    (TokenType.TRUE,    r'true\b'),
-    (TokenType.FALSE,   r'false\b'),
-    (TokenType.NETWORK, r'network\b'),
-    (TokenType.IMPORT,  r'import\b'),
-    (TokenType.AS,      r'as\b'),
     (TokenType.FLOAT,   r'\d+\.\d+'),
     (TokenType.INTEGER, r'\d+'),
     (TokenType.STRING,  r'"(?:\\.|[^"\\])*"'),
@@ -110,38 +86,76 @@ token_spec = [
     ("MISMATCH",        r'.'),
 ]
 
+# Keywords are matched as identifiers and looked up here, so the regex doesn't try
+# every keyword alternative before falling through to IDENT at each position.
+KEYWORDS = {
+    'if': TokenType.IF,
+    'elif': TokenType.ELIF,
+    'else': TokenType.ELSE,
+    'while': TokenType.WHILE,
+    'for': TokenType.FOR,
+    'not': TokenType.NOT,
+    'in': TokenType.IN,
+    'with': TokenType.WITH,
+    'try': TokenType.TRY,
+    'catch': TokenType.CATCH,
+    'finally': TokenType.FINALLY,
+    'throw': TokenType.THROW,
+    'break': TokenType.BREAK,
+    'continue': TokenType.CONTINUE,
+    'fun': TokenType.FUN,
+    'class': TokenType.CLASS,
+    'super': TokenType.SUPER,
+    'inherits': TokenType.INHERITS,
+    'return': TokenType.RETURN,
+    'print': TokenType.PRINT,
+    'true': TokenType.TRUE,
+    'false': TokenType.FALSE,
+    'network': TokenType.NETWORK,
+    'import': TokenType.IMPORT,
+    'as': TokenType.AS,
+}
+
 token_regex = '|'.join(f'(?P<{spec[0].name if isinstance(spec[0], Enum) else spec[0]}>{spec[1]})' for spec in token_spec)
- 
+token_pattern = re.compile(token_regex)
+TOKEN_TYPES = {member.name: member for member in TokenType}
+IGNORED = frozenset(("COMMENT", "SKIP", "MISMATCH"))
+
 def tokenize(code):
     tokens = []
+    append = tokens.append
     line_num = 1
 
-    for mo in re.finditer(token_regex, code):
+    for mo in token_pattern.finditer(code):
         kind_str = mo.lastgroup
-        value = mo.group()
 
-        if kind_str == "COMMENT":
+        if kind_str in IGNORED:
             continue
         if kind_str == "NEWLINE":
             line_num += 1
             continue
-        if kind_str == "SKIP" or kind_str == "MISMATCH":
-            continue
-
-        kind = TokenType[kind_str]
 
-        if kind == TokenType.FLOAT:
-            value = float(value)
-        elif kind == TokenType.INTEGER:
-            value = int(value)
-        elif kind == TokenType.STRING:
-            value = bytes(value[1:-1], "utf-8").decode("unicode_escape")
-        elif kind == TokenType.TRUE:
-            value = True
-        elif kind == TokenType.FALSE:
-            value = False
+        value = mo.group()
+        if kind_str == "IDENT":
+            kind = KEYWORDS.get(value)
+            if kind is None:
+                # Interned so scope and field dicts can match names by identity
+                append((TokenType.IDENT, sys.intern(value), line_num))
+                continue
+            if kind is TokenType.TRUE:
+                value = True
+            elif kind is TokenType.FALSE:
+                value = False
+        else:
+            kind = TOKEN_TYPES[kind_str]
+            if kind is TokenType.FLOAT:
+                value = float(value)
+            elif kind is TokenType.INTEGER:
+                value = int(value)
+            elif kind is TokenType.STRING:
+                value = bytes(value[1:-1], "utf-8").decode("unicode_escape")
 
-        tokens.append((kind, value, line_num))
+        append((kind, value, line_num))
 
     tokens.append((TokenType.EOF, None,line_num))
-    return tokens
\ No newline at end of file
+    return tokens
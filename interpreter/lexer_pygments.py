@@ -1,4 +1,4 @@
-from pygments.lexer import RegexLexer, bygroups, words
+from pygments.lexer import RegexLexer, words
 from pygments.token import *
 
 class MlscriptLexer(RegexLexer):
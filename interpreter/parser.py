@@ -2,10 +2,36 @@
 from .lexer import TokenType
 from .ast_nodes import *
 
+# Token types as plain globals: every `TokenType.X` goes through the Enum metaclass,
+# which costs several times a global load, and the parser compares token types constantly
+(PRINT, FUN, CLASS, INHERITS, SUPER, RETURN, IF, ELIF, ELSE, WHILE, FOR, IN, NOT, BREAK,
+ CONTINUE, WITH, IMPORT, AS, THROW, TRY, CATCH, FINALLY, NETWORK) = (
+    TokenType.PRINT, TokenType.FUN, TokenType.CLASS, TokenType.INHERITS, TokenType.SUPER,
+    TokenType.RETURN, TokenType.IF, TokenType.ELIF, TokenType.ELSE, TokenType.WHILE,
+    TokenType.FOR, TokenType.IN, TokenType.NOT, TokenType.BREAK, TokenType.CONTINUE,
+    TokenType.WITH, TokenType.IMPORT, TokenType.AS, TokenType.THROW, TokenType.TRY,
+    TokenType.CATCH, TokenType.FINALLY, TokenType.NETWORK)
+IDENT, INTEGER, FLOAT, STRING, TRUE, FALSE, EOF = (
+    TokenType.IDENT, TokenType.INTEGER, TokenType.FLOAT, TokenType.STRING, TokenType.TRUE,
+    TokenType.FALSE, TokenType.EOF)
+EQ, NE, LT, LTE, GT, GTE, ASSIGN, PLUS, MINUS, MUL, DIV = (
+    TokenType.EQ, TokenType.NE, TokenType.LT, TokenType.LTE, TokenType.GT, TokenType.GTE,
+    TokenType.ASSIGN, TokenType.PLUS, TokenType.MINUS, TokenType.MUL, TokenType.DIV)
+LPAREN, RPAREN, LBRACE, RBRACE, LBRACKET, RBRACKET, COMMA, COLON, DOT = (
+    TokenType.LPAREN, TokenType.RPAREN, TokenType.LBRACE, TokenType.RBRACE,
+    TokenType.LBRACKET, TokenType.RBRACKET, TokenType.COMMA, TokenType.COLON, TokenType.DOT)
+
+# Operator tokens checked once per operand, built once instead of per check
+COMPARISON_TOKENS = frozenset((EQ, NE, LT, LTE, GT, GTE, IN))
+ADDITIVE_TOKENS = frozenset((PLUS, MINUS))
+BLOCK_END_TOKENS = frozenset((RBRACE, EOF))
+# Arithmetic operators by binding strength, all left-associative
+ARITHMETIC_PRECEDENCE = {PLUS: 1, MINUS: 1, MUL: 2, DIV: 2}
+
 class Parser:
     def __init__(self, tokens,code):
         self.tokens = tokens
-        self.code_lines = code.split('\n')
+        self.code = code  # Only split into lines to quote one in a syntax error
         self.pos = 0
         self.current_token = self.tokens[self.pos]
         self.in_loop = False
@@ -19,7 +45,7 @@ class Parser:
 
     def error(self, expected_type):
         token_type, token_value, line_num = self.current_token
-        line = self.code_lines[line_num - 1]
+        line = self.code.split('\n')[line_num - 1]
 
         error_message = f"""SyntaxError: Expected {expected_type}, but got {token_type} at line {line_num}: {line.strip()}"""
         raise Exception(error_message)
@@ -35,67 +61,44 @@ class Parser:
     def parse(self):
         """Parse a list of statements."""
         statements = []
-        while self.current_token[0] != TokenType.EOF:
+        while self.current_token[0] != EOF:
             statements.append(self.statement())
         return statements
 
     def statement(self):
-        token_type = self.current_token[0]
-
-        if token_type == TokenType.PRINT:
-            return self.print_statement()
-        elif token_type == TokenType.FUN:
-            return self.function_definition()
-        elif token_type == TokenType.CLASS:
-            return self.class_definition()
-        elif token_type == TokenType.IF:
-            return self.if_statement()
-        elif token_type == TokenType.WHILE:
-            return self.while_statement()
-        elif token_type == TokenType.FOR:
-            return self.for_statement()
-        elif token_type == TokenType.WITH:
-            return self.with_statement()
-        elif token_type == TokenType.IMPORT:
-            return self.import_statement()
-        elif token_type == TokenType.THROW:
-            return self.throw_statement()
-        elif token_type == TokenType.TRY:
-            return self.try_catch_statement()
-        elif token_type == TokenType.BREAK:
-            return self.break_statement()
-        elif token_type == TokenType.CONTINUE:
-            return self.continue_statement()
-        elif token_type == TokenType.RETURN:
-            self.advance()
-            expr = self.comparison_expression()
-            return ReturnStatement(expr)
-        else:
-            return self.assignment_or_expression_statement()
+        parse = STATEMENT_PARSERS.get(self.current_token[0])
+        if parse is not None:
+            return parse(self)
+        return self.assignment_or_expression_statement()
+
+    def return_statement(self):
+        self.advance()
+        expr = self.comparison_expression()
+        return ReturnStatement(expr)
 
     def throw_statement(self):
         token = self.current_token
-        self.eat(TokenType.THROW)
+        self.eat(THROW)
         expr = self.comparison_expression()
         return ThrowStatement(token, expr)
 
     def try_catch_statement(self):
-        self.eat(TokenType.TRY)
+        self.eat(TRY)
         try_block = self.block()
 
         catch_variable = None
         catch_block = None
-        if self.current_token[0] == TokenType.CATCH:
-            self.eat(TokenType.CATCH)
-            self.eat(TokenType.LPAREN)
+        if self.current_token[0] == CATCH:
+            self.advance()
+            self.eat(LPAREN)
             catch_variable = Variable(self.current_token)
-            self.eat(TokenType.IDENT)
-            self.eat(TokenType.RPAREN)
+            self.eat(IDENT)
+            self.eat(RPAREN)
             catch_block = self.block()
 
         finally_block = None
-        if self.current_token[0] == TokenType.FINALLY:
-            self.eat(TokenType.FINALLY)
+        if self.current_token[0] == FINALLY:
+            self.advance()
             finally_block = self.block()
         
         if not catch_block and not finally_block:
@@ -106,64 +109,64 @@ class Parser:
     def assignment_or_expression_statement(self):
         expr = self.comparison_expression()
 
-        if self.current_token[0] == TokenType.ASSIGN:
-            self.eat(TokenType.ASSIGN)
+        if self.current_token[0] == ASSIGN:
+            self.advance()
             right_expr = self.comparison_expression()
 
             if isinstance(expr, Variable):
-                return Assign(expr, right_expr)
+                return make_assign(expr, right_expr)
             elif isinstance(expr, IndexAccess):
                 return IndexAssign(expr.collection, expr.index_expr, right_expr)
             elif isinstance(expr, AttributeAccess):
-                return AttributeAssign(expr.obj,expr.token,right_expr)
+                return AttributeAssign(expr.obj, expr.attribute, expr.line, right_expr)
             else:
                 raise SyntaxError("The left-hand side of an assignment must be a variable or an index.")
         return expr
 
     def print_statement(self):
-        self.eat(TokenType.PRINT)
-        self.eat(TokenType.LPAREN)
+        self.eat(PRINT)
+        self.eat(LPAREN)
         
         exprs = []
-        if self.current_token[0] != TokenType.RPAREN:
+        if self.current_token[0] != RPAREN:
             exprs.append(self.comparison_expression())
-            while self.current_token[0] == TokenType.COMMA:
-                self.eat(TokenType.COMMA)
+            while self.current_token[0] == COMMA:
+                self.advance()
                 exprs.append(self.comparison_expression())
 
-        self.eat(TokenType.RPAREN)
+        self.eat(RPAREN)
         return PrintStatement(exprs)
 
     def assignment_statement(self):
         ident_token = self.current_token
-        self.eat(TokenType.IDENT)
-        self.eat(TokenType.ASSIGN)
+        self.eat(IDENT)
+        self.eat(ASSIGN)
         expr = self.comparison_expression()
-        return Assign(Variable(ident_token), expr)
+        return make_assign(Variable(ident_token), expr)
 
     def if_statement(self):
         cases = []
         # Parse the initial 'if'
-        self.eat(TokenType.IF)
-        self.eat(TokenType.LPAREN)
+        self.eat(IF)
+        self.eat(LPAREN)
         condition = self.comparison_expression()
-        self.eat(TokenType.RPAREN)
+        self.eat(RPAREN)
         body = self.block()
         cases.append((condition, body))
 
         # Parse all 'elif' blocks
-        while self.current_token[0] == TokenType.ELIF:
-            self.eat(TokenType.ELIF)
-            self.eat(TokenType.LPAREN)
+        while self.current_token[0] == ELIF:
+            self.advance()
+            self.eat(LPAREN)
             condition = self.comparison_expression()
-            self.eat(TokenType.RPAREN)
+            self.eat(RPAREN)
             body = self.block()
             cases.append((condition, body))
 
         # Parse the final 'else' block, if it exists
         else_body = None
-        if self.current_token[0] == TokenType.ELSE:
-            self.eat(TokenType.ELSE)
+        if self.current_token[0] == ELSE:
+            self.advance()
             else_body = self.block()
 
         # Build the nested IfStatement node from the cases
@@ -179,10 +182,10 @@ class Parser:
         return node
     
     def while_statement(self):
-        self.eat(TokenType.WHILE)
-        self.eat(TokenType.LPAREN)
+        self.eat(WHILE)
+        self.eat(LPAREN)
         condition = self.comparison_expression()
-        self.eat(TokenType.RPAREN)
+        self.eat(RPAREN)
 
         original_in_loop = self.in_loop
         self.in_loop = True
@@ -194,10 +197,10 @@ class Parser:
         return WhileStatement(condition, body)
     
     def for_statement(self):
-        self.eat(TokenType.FOR)
+        self.eat(FOR)
         variable_node = Variable(self.current_token)
-        self.eat(TokenType.IDENT)
-        self.eat(TokenType.IN)
+        self.eat(IDENT)
+        self.eat(IN)
 
         iterable_node = self.comparison_expression()
 
@@ -211,36 +214,38 @@ class Parser:
         return ForStatement(variable_node, iterable_node, body)
     
     def with_statement(self):
-        self.eat(TokenType.WITH)
+        self.eat(WITH)
         context_expr = self.comparison_expression()
         body = self.block()
+        if isinstance(context_expr, Variable) and context_expr.name == 'no_grad':
+            return NoGradBlock(context_expr, body)
         return WithStatement(context_expr, body)
     
     def import_statement(self):
-        self.eat(TokenType.IMPORT)
+        self.eat(IMPORT)
         module_name_token = self.current_token
-        self.eat(TokenType.STRING)
-        self.eat(TokenType.AS)
+        self.eat(STRING)
+        self.eat(AS)
         alias_token = self.current_token
-        self.eat(TokenType.IDENT)
+        self.eat(IDENT)
         return ImportStatement(module_name_token, alias_token)
 
     def function_definition(self):
-        self.eat(TokenType.FUN)
+        self.eat(FUN)
         name_token = self.current_token
-        self.eat(TokenType.IDENT)
-        self.eat(TokenType.LPAREN)
+        self.eat(IDENT)
+        self.eat(LPAREN)
         
         params = []
         has_seen_default = False
 
-        if self.current_token[0] != TokenType.RPAREN:
+        if self.current_token[0] != RPAREN:
             while True:
                 param_name = Variable(self.current_token)
-                self.eat(TokenType.IDENT)
+                self.eat(IDENT)
                 
-                if self.current_token[0] == TokenType.ASSIGN:
-                    self.eat(TokenType.ASSIGN)
+                if self.current_token[0] == ASSIGN:
+                    self.advance()
                     default_value = self.comparison_expression()
                     params.append((param_name, default_value))
                     has_seen_default = True
@@ -249,22 +254,22 @@ class Parser:
                         self.error("non-default argument follows default argument")
                     params.append((param_name, None))
 
-                if self.current_token[0] == TokenType.COMMA:
-                    self.eat(TokenType.COMMA)
+                if self.current_token[0] == COMMA:
+                    self.advance()
                 else:
                     break
 
-        self.eat(TokenType.RPAREN)
+        self.eat(RPAREN)
         body = self.block()
         return FunctionDef(name_token, params, body)
 
     def block(self):
         """Parses a block of statements enclosed in curly braces."""
-        self.eat(TokenType.LBRACE)
+        self.eat(LBRACE)
         statements = []
-        while self.current_token[0] not in (TokenType.RBRACE, TokenType.EOF):
+        while self.current_token[0] not in BLOCK_END_TOKENS:
             statements.append(self.statement())
-        self.eat(TokenType.RBRACE)
+        self.eat(RBRACE)
         return Block(statements)
 
     def comparison_expression(self):
@@ -272,49 +277,38 @@ class Parser:
         node = self.expr()
 
         # Handle 'not in' operator as a special case
-        if self.current_token[0] == TokenType.NOT:
-            self.eat(TokenType.NOT)
-            if self.current_token[0] != TokenType.IN:
+        if self.current_token[0] == NOT:
+            self.advance()
+            if self.current_token[0] != IN:
                 self.error("Expected 'in' after 'not'")
 
             in_token = self.current_token
-            self.eat(TokenType.IN)
+            self.eat(IN)
             op_token = (in_token[0], 'not in', in_token[2])
-            node = BinOp(node, op_token, self.expr())
+            node = make_binop(node, op_token, self.expr())
             return node
 
         # Handle other comparison operators
-        op_types = [
-            TokenType.EQ, TokenType.NE, TokenType.LT,
-            TokenType.LTE, TokenType.GT, TokenType.GTE, TokenType.IN
-        ]
-        while self.current_token[0] in op_types:
+        while self.current_token[0] in COMPARISON_TOKENS:
             op_token = self.current_token
-            self.eat(op_token[0])
-            node = BinOp(node, op_token, self.expr())
-        return node
-
-    def expr(self):
-        """Parses addition and subtraction."""
-        node = self.term()
-        while self.current_token[0] in (TokenType.PLUS, TokenType.MINUS):
-            op_token = self.current_token
-            self.eat(op_token[0])
-            node = BinOp(node, op_token, self.term())
+            self.advance()
+            node = make_binop(node, op_token, self.expr())
         return node
 
-    def term(self):
-        """Parses multiplication and division."""
+    def expr(self, min_precedence=1):
+        """Parses arithmetic, binding operators at least as strong as `min_precedence`."""
         node = self.factor()
-        while self.current_token[0] in (TokenType.MUL, TokenType.DIV):
+        while True:
             op_token = self.current_token
-            self.eat(op_token[0])
-            node = BinOp(node, op_token, self.factor()) 
-        return node
+            precedence = ARITHMETIC_PRECEDENCE.get(op_token[0], 0)
+            if precedence < min_precedence:
+                return node
+            self.advance()
+            node = make_binop(node, op_token, self.expr(precedence + 1))
 
     def factor(self):
         token = self.current_token
-        if token[0] in (TokenType.PLUS, TokenType.MINUS):
+        if token[0] in ADDITIVE_TOKENS:
             self.advance()
             return UnaryOp(token, self.factor())
         return self.call_and_index()
@@ -323,140 +317,141 @@ class Parser:
         node = self.primary()
 
         while True:
-            if self.current_token[0] == TokenType.LPAREN:
-                self.eat(TokenType.LPAREN)
+            if self.current_token[0] == LPAREN:
+                self.advance()
                 args = []
                 kwargs = {}
-                if self.current_token[0] != TokenType.RPAREN:
+                if self.current_token[0] != RPAREN:
                     while True:
-                        if self.current_token[0] == TokenType.IDENT and self.tokens[self.pos + 1][0] == TokenType.ASSIGN:
+                        if self.current_token[0] == IDENT and self.tokens[self.pos + 1][0] == ASSIGN:
                             key = self.current_token[1]
-                            self.eat(TokenType.IDENT)
-                            self.eat(TokenType.ASSIGN)
+                            self.eat(IDENT)
+                            self.eat(ASSIGN)
                             value = self.comparison_expression()
                             kwargs[key] = value
                         else:
                             args.append(self.comparison_expression())
 
-                        if self.current_token[0] == TokenType.COMMA:
-                            self.eat(TokenType.COMMA)
+                        if self.current_token[0] == COMMA:
+                            self.advance()
                         else:
                             break
-                self.eat(TokenType.RPAREN)
+                self.eat(RPAREN)
                 node = FunctionCall(node, args, kwargs)
-            elif self.current_token[0] == TokenType.LBRACKET:
-                self.eat(TokenType.LBRACKET)
+            elif self.current_token[0] == LBRACKET:
+                self.advance()
                 index_expr = []
-                if self.current_token[0] != TokenType.RBRACKET:
-                    def parse_slice_or_expr():
-                        start=None
-                        if self.current_token[0] != TokenType.COLON:
-                            start = self.comparison_expression()
-                        if self.current_token[0] != TokenType.COLON:
-                            return start
-                        self.eat(TokenType.COLON)
-                        stop = None
-                        if self.current_token[0] not in (TokenType.COLON, TokenType.RBRACKET):
-                            stop = self.comparison_expression()
-                        step = None
-                        if self.current_token[0] == TokenType.COLON:
-                            self.eat(TokenType.COLON)
-                            if self.current_token[0] not in (TokenType.RBRACKET, TokenType.COMMA):
-                                step = self.comparison_expression()
-
-                        return SliceNode(start, stop, step)
-                        
-                    index_expr.append(parse_slice_or_expr())
-                    while self.current_token[0] == TokenType.COMMA:
-                        self.eat(TokenType.COMMA)
-                        index_expr.append(parse_slice_or_expr())
+                if self.current_token[0] != RBRACKET:
+                    index_expr.append(self.slice_or_expression())
+                    while self.current_token[0] == COMMA:
+                        self.advance()
+                        index_expr.append(self.slice_or_expression())
                 
-                self.eat(TokenType.RBRACKET)
+                self.eat(RBRACKET)
                 node = IndexAccess(node, index_expr)
-            elif self.current_token[0] == TokenType.DOT:
-                self.eat(TokenType.DOT)
+            elif self.current_token[0] == DOT:
+                self.advance()
                 attr_token = self.current_token
-                self.eat(TokenType.IDENT)
+                self.eat(IDENT)
                 node = AttributeAccess(node, attr_token)
             else:
                 break
         return node
     
+    def slice_or_expression(self):
+        """Parses one subscript: an expression or a `start:stop:step` slice."""
+        start = None
+        if self.current_token[0] != COLON:
+            start = self.comparison_expression()
+        if self.current_token[0] != COLON:
+            return start
+        self.advance()
+        stop = None
+        if self.current_token[0] not in (COLON, RBRACKET):
+            stop = self.comparison_expression()
+        step = None
+        if self.current_token[0] == COLON:
+            self.advance()
+            if self.current_token[0] not in (RBRACKET, COMMA):
+                step = self.comparison_expression()
+        return SliceNode(start, stop, step)
+
     def primary(self):
         token = self.current_token
         token_type = token[0]
 
-        if token_type == TokenType.STRING:
+        # Names and numbers make up most operands, so they are tested first
+        if token_type == IDENT:
             self.advance()
-            return StringLiteral(token)
-        elif token_type in (TokenType.INTEGER, TokenType.FLOAT):
+            return Variable(token)
+        elif token_type in (INTEGER, FLOAT):
             self.advance()
             return Number(token)
-        elif token_type in (TokenType.TRUE, TokenType.FALSE):
+        elif token_type in (TRUE, FALSE):
             self.advance()
             return BooleanLiteral(token)
-        elif token_type == TokenType.SUPER:
+        elif token_type == SUPER:
             if not self.in_class:
                 self.error("The 'super' keyword can only be used inside a class method.")
             self.advance()
             return SuperNode(token)
-        elif token_type == TokenType.LBRACKET:
+        elif token_type == LBRACKET:
             return self.list_expression()
-        elif token_type == TokenType.LBRACE:
+        elif token_type == LBRACE:
             return self.dict_expression()
-        elif token_type == TokenType.NETWORK:
+        elif token_type == NETWORK:
             return self.network_literal()
-        elif token_type == TokenType.IDENT:
+        elif token_type == STRING:
             self.advance()
-            return Variable(token)
-        elif token_type == TokenType.LPAREN:
+            return StringLiteral(token)
+        elif token_type == LPAREN:
             start_token = self.current_token
-            self.eat(TokenType.LPAREN)
+            self.eat(LPAREN)
 
-            if self.current_token[0] == TokenType.RPAREN:
-                self.eat(TokenType.RPAREN)
+            if self.current_token[0] == RPAREN:
+                self.advance()
                 return TupleLiteral(start_token, [])
 
             node = self.comparison_expression()
 
-            if self.current_token[0] == TokenType.COMMA:
+            if self.current_token[0] == COMMA:
                 elements = [node]
-                while self.current_token[0] == TokenType.COMMA:
-                    self.eat(TokenType.COMMA)
-                    if self.current_token[0] == TokenType.RPAREN:
+                while self.current_token[0] == COMMA:
+                    self.advance()
+                    if self.current_token[0] == RPAREN:
                         break
                     elements.append(self.comparison_expression())
-                self.eat(TokenType.RPAREN)
+                self.eat(RPAREN)
                 return TupleLiteral(start_token, elements)
             
-            self.eat(TokenType.RPAREN)
+            self.eat(RPAREN)
             return node
         else:
             raise SyntaxError(f"Unexpected token {self.current_token} in expression")
         
     def network_literal(self):
         start_token = self.current_token
-        self.eat(TokenType.NETWORK)
-        self.eat(TokenType.LBRACE)
+        self.eat(NETWORK)
+        self.eat(LBRACE)
 
         attributes = {}
         required_keys = {"input", "layers", "optimizer", "loss"}
 
-        while self.current_token[0] != TokenType.RBRACE:
-            if self.current_token[0] != TokenType.IDENT:
+        while self.current_token[0] != RBRACE:
+            if self.current_token[0] != IDENT:
                 self.error("Expected an identifier (e.g., 'input', 'layers') in network block.")
 
             key = self.current_token[1]
-            self.eat(TokenType.IDENT)
-            self.eat(TokenType.COLON)
+            self.eat(IDENT)
+            self.eat(COLON)
 
             value_expr = self.comparison_expression()
             attributes[key] = value_expr
 
-            if self.current_token[0] == TokenType.COMMA:
-                self.eat(TokenType.COMMA)
+            if self.current_token[0] == COMMA:
+                self.advance()
 
-        self.eat(TokenType.RBRACE)
+        self.eat(RBRACE)
 
         # Validation of required keys
         provided_keys = set(attributes.keys())
@@ -473,79 +468,96 @@ class Parser:
     def list_expression(self):
         """Parses a list literal."""
         start_token = self.current_token
-        self.eat(TokenType.LBRACKET)
+        self.eat(LBRACKET)
         elements = []
-        if self.current_token[0] != TokenType.RBRACKET:
+        if self.current_token[0] != RBRACKET:
             elements.append(self.comparison_expression())
-            while self.current_token[0] == TokenType.COMMA:
-                self.eat(TokenType.COMMA)
+            while self.current_token[0] == COMMA:
+                self.advance()
                 elements.append(self.comparison_expression())
-        self.eat(TokenType.RBRACKET)
+        self.eat(RBRACKET)
         return ListLiteral(start_token,elements)
 
     def dict_expression(self):
         """Parses a dictionary literal."""
         start_token = self.current_token
-        self.eat(TokenType.LBRACE)
+        self.eat(LBRACE)
         pairs = []
-        if self.current_token[0] != TokenType.RBRACE:
+        if self.current_token[0] != RBRACE:
             key = self.comparison_expression()
-            self.eat(TokenType.COLON)
+            self.eat(COLON)
             value_node = self.comparison_expression()
             pairs.append((key, value_node))
 
-            while self.current_token[0] == TokenType.COMMA:
-                self.eat(TokenType.COMMA)
+            while self.current_token[0] == COMMA:
+                self.advance()
                 key_node = self.comparison_expression()
-                self.eat(TokenType.COLON)
+                self.eat(COLON)
                 value_node = self.comparison_expression()
                 pairs.append((key_node, value_node))
-        self.eat(TokenType.RBRACE)
+        self.eat(RBRACE)
         return DictLiteral(start_token, pairs)
     
     def break_statement(self):
         if not self.in_loop:
             self.error("Break statement can only be used inside a loop.")
         token = self.current_token
-        self.eat(TokenType.BREAK)
+        self.eat(BREAK)
         return BreakStatement(token)
     
     def continue_statement(self):
         if not self.in_loop:
             self.error("Continue statement can only be used inside a loop.")
         token = self.current_token
-        self.eat(TokenType.CONTINUE)
+        self.eat(CONTINUE)
         return ContinueStatement(token)
     
     def class_definition(self):
-        self.eat(TokenType.CLASS)
+        self.eat(CLASS)
         name_token = self.current_token
-        self.eat(TokenType.IDENT)
+        self.eat(IDENT)
 
         parents = []
-        if self.current_token[0] == TokenType.INHERITS:
-            self.eat(TokenType.INHERITS)
+        if self.current_token[0] == INHERITS:
+            self.advance()
             parents.append(Variable(self.current_token))
-            self.eat(TokenType.IDENT)
-            while self.current_token[0] == TokenType.COMMA:
-                self.eat(TokenType.COMMA)
+            self.eat(IDENT)
+            while self.current_token[0] == COMMA:
+                self.advance()
                 parents.append(Variable(self.current_token))
-                self.eat(TokenType.IDENT)
+                self.eat(IDENT)
 
-        self.eat(TokenType.LBRACE)
+        self.eat(LBRACE)
 
         original_in_class = self.in_class
         self.in_class = True
         try:
 
             methods=[]
-            while self.current_token[0] != TokenType.RBRACE:
-                if self.current_token[0] == TokenType.FUN:
+            while self.current_token[0] != RBRACE:
+                if self.current_token[0] == FUN:
                     methods.append(self.function_definition())
                 else:
                     self.error("Only method definitions ('fun') are allowed inside a class body.")
         finally:
             self.in_class = original_in_class
         
-        self.eat(TokenType.RBRACE)
-        return ClassDef(name_token,parents,methods)
\ No newline at end of file
+        self.eat(RBRACE)
+        return ClassDef(name_token,parents,methods)
+
+# Statement parsers by leading keyword; anything else is an assignment or expression
+STATEMENT_PARSERS = {
+    PRINT: Parser.print_statement,
+    FUN: Parser.function_definition,
+    CLASS: Parser.class_definition,
+    IF: Parser.if_statement,
+    WHILE: Parser.while_statement,
+    FOR: Parser.for_statement,
+    WITH: Parser.with_statement,
+    IMPORT: Parser.import_statement,
+    THROW: Parser.throw_statement,
+    TRY: Parser.try_catch_statement,
+    BREAK: Parser.break_statement,
+    CONTINUE: Parser.continue_statement,
+    RETURN: Parser.return_statement,
+}
@@ -0,0 +1,129 @@
+# resolver.py
+from .ast_nodes import *
+
+# Marks a frame slot whose variable has not been assigned yet in the current call.
+UNSET = object()
+
+def bound_names(node):
+    """Yields each name that running `node` can bind in some scope."""
+    if isinstance(node, Assign):
+        yield node.left.name
+    elif isinstance(node, ForStatement):
+        yield node.variable.name
+    elif isinstance(node, TryCatch) and node.catch_variable:
+        yield node.catch_variable.name
+    elif isinstance(node, ImportStatement):
+        yield node.alias
+    elif isinstance(node, ClassDef):
+        yield node.name
+    elif isinstance(node, FunctionDef):
+        yield from node.param_names
+    for child in iter_child_nodes(node):
+        yield from bound_names(child)
+
+class Resolver:
+    """Assigns frame slots to function locals so reads skip the evaluator's scope chain.
+
+    Scoping is dynamic, so a slot is only handed out for a name whose value in the
+    function's own scope can change solely through the function's parameters and its
+    top-level assignments (which also write the frame). Names that are bound inside a
+    nested scope (for loops, catch blocks) or by import/class statements keep going
+    through `get_variable`, as does any read that happens before the slot is filled.
+    Slotted locals of a function that makes no calls live only in its frame, and if
+    nothing else is bound in its scope the call doesn't push one at all.
+    It also marks self tail calls, which the interpreter runs without nesting a scope.
+    """
+    def resolve(self, statements):
+        for stmt in statements:
+            self._find_functions(stmt)
+
+    def _find_functions(self, node):
+        if isinstance(node, FunctionDef):
+            self._resolve_function(node)
+        for child in iter_child_nodes(node):
+            self._find_functions(child)
+
+    def _resolve_function(self, func_def):
+        assigned = list(func_def.param_names)
+        excluded = set()
+        self._collect_bindings(func_def.body, False, assigned, excluded)
+
+        slots = {}
+        for name in assigned:
+            if name not in excluded and name not in slots:
+                slots[name] = len(slots)
+
+        func_def.param_slots = tuple(slots.get(name) for name in func_def.param_names)
+        self._annotate(func_def.body, slots)
+        func_def.frame_size = len(slots)
+        # Only code running in a call made from this function can look its locals up by
+        # name, so without calls the slotted locals never need to reach the scope.
+        # A default left to run at call time reads the earlier parameters by name.
+        func_def.private_frame = (not self._makes_calls(func_def.body)
+                                  and all(default_node is None or name in func_def.constant_defaults
+                                          for name, default_node in zip(func_def.param_names, func_def.param_defaults)))
+        # If, on top of that, every name bound in the function's own scope has a slot,
+        # the scope stays empty and the call can skip pushing it.
+        func_def.needs_scope = not func_def.private_frame or any(name not in slots for name in assigned)
+        self._mark_tail_calls(func_def.body, func_def.name)
+
+    def _collect_bindings(self, node, nested, assigned, excluded):
+        """Records names assigned in the function's own scope and names bound in any other way."""
+        if isinstance(node, FunctionDef):
+            return
+        if isinstance(node, Assign):
+            (excluded.add if nested else assigned.append)(node.left.name)
+        elif isinstance(node, ForStatement):
+            excluded.add(node.variable.name)
+            self._collect_bindings(node.iterable, nested, assigned, excluded)
+            self._collect_bindings(node.body, True, assigned, excluded)
+            return
+        elif isinstance(node, TryCatch):
+            if node.catch_variable:
+                excluded.add(node.catch_variable.name)
+            self._collect_bindings(node.try_block, nested, assigned, excluded)
+            if node.catch_block:
+                self._collect_bindings(node.catch_block, True, assigned, excluded)
+            if node.finally_block:
+                self._collect_bindings(node.finally_block, nested, assigned, excluded)
+            return
+        elif isinstance(node, ImportStatement):
+            excluded.add(node.alias)
+            if not nested:
+                assigned.append(node.alias)
+        elif isinstance(node, ClassDef):
+            excluded.add(node.name)
+            if not nested:
+                assigned.append(node.name)
+        for child in iter_child_nodes(node):
+            self._collect_bindings(child, nested, assigned, excluded)
+
+    def _annotate(self, node, slots):
+        if isinstance(node, FunctionDef):
+            return
+        if isinstance(node, Variable):
+            node.slot = slots.get(node.name)
+        for child in iter_child_nodes(node):
+            self._annotate(child, slots)
+
+    def _makes_calls(self, node):
+        if isinstance(node, FunctionDef):
+            return False
+        if isinstance(node, FunctionCall):
+            return True
+        return any(self._makes_calls(child) for child in iter_child_nodes(node))
+
+    def _mark_tail_calls(self, node, name):
+        """Marks `return name(...)` statements that leave the function without passing through
+        a scope, try or with statement, so the call can reuse the function's own scope."""
+        if isinstance(node, Block):
+            for stmt in node.statements:
+                self._mark_tail_calls(stmt, name)
+        elif isinstance(node, IfStatement):
+            self._mark_tail_calls(node.if_block, name)
+            if node.else_block:
+                self._mark_tail_calls(node.else_block, name)
+        elif isinstance(node, WhileStatement):
+            self._mark_tail_calls(node.body, name)
+        elif isinstance(node, ReturnStatement):
+            node.tail_call = isinstance(node.expr, FunctionCall) and node.expr._callee_name == name
@@ -1,6 +1,7 @@
 import sys
 import json
 import os
+import platform
 from jupyter_client.kernelspec import KernelSpecManager
 from IPython.utils.tempdir import TemporaryDirectory
 
@@ -10,6 +11,13 @@ kernel_json = {
     "display_name": "mlscript",
     "language": "mlscript",
 }
+kernel_name = 'mlscript'
+
+# Installing from PyPy registers a separate kernel, so the JIT-run interpreter
+# sits next to the CPython one instead of replacing it
+if platform.python_implementation() == 'PyPy':
+    kernel_json["display_name"] = "mlscript (PyPy)"
+    kernel_name = 'mlscript-pypy'
 
 def install_my_kernel_spec(user=True):
     with TemporaryDirectory() as td:
@@ -18,7 +26,7 @@ def install_my_kernel_spec(user=True):
             json.dump(kernel_json, f, sort_keys=True)
         
         print('Installing Jupyter kernel spec...')
-        KernelSpecManager().install_kernel_spec(td, 'mlscript', user=user, replace=True)
+        KernelSpecManager().install_kernel_spec(td, kernel_name, user=user, replace=True)
 
 def _is_root():
     try:
@@ -1,8 +1,7 @@
 import os
 import sys
-import io
+import functools
 import traceback
-from contextlib import redirect_stdout
 
 # On Windows, Python 3.8+ needs help finding DLLs in a venv
 # This code adds the venv's library paths to the DLL search path
@@ -22,6 +21,8 @@ if os.name == 'nt':
 # We wrap the import in a try/except to log startup crashes
 try:
     from interpreter.core import Interpreter
+    from interpreter.app import warm_up
+    warm_up()
     INTERPRETER_INSTANCE = Interpreter()
     IMPORT_ERROR = None
 except Exception:
@@ -33,6 +34,37 @@ except Exception:
 
 from ipykernel.kernelbase import Kernel
 
+@functools.lru_cache(maxsize=256)
+def parse_cell(code):
+    """Parses a cell once; re-running an unchanged cell reuses its tree."""
+    return INTERPRETER_INSTANCE.parse(code)
+
+def _is_effectively_empty(code):
+    """True for a cell of only blank lines and `//` comments."""
+    return all(not line or line.startswith('//') for line in map(str.strip, code.splitlines()))
+
+class _IOPubStream:
+    """Stands in for sys.stdout during a cell, sending each completed line to iopub
+    as it is printed rather than the whole output once the cell ends."""
+    def __init__(self, kernel, silent):
+        self.kernel = kernel
+        self.silent = silent
+        self.pending = ''  # print() writes the text and its newline separately
+
+    def write(self, text):
+        if self.silent:
+            return len(text)
+        self.pending += text
+        if '\n' in text:
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        if self.pending:
+            stream_content = {'name': 'stdout', 'text': self.pending}
+            self.kernel.send_response(self.kernel.iopub_socket, 'stream', stream_content)
+            self.pending = ''
+
 class MLScriptKernel(Kernel):
     implementation = 'mlscript'
     implementation_version = '1.0.0'
@@ -58,21 +90,19 @@ class MLScriptKernel(Kernel):
             return {'status': 'error', 'execution_count': self.execution_count,
                     'ename': 'ImportError', 'evalue': 'Failed to import backend', 'traceback': []}
         
-        if not code.strip():
+        if _is_effectively_empty(code):
             return {'status': 'ok', 'execution_count': self.execution_count,
                     'payload': [], 'user_expressions': {}}
 
-        f = io.StringIO()
-
         try:
-            with redirect_stdout(f):
-                self.interp.run(code)
-            
-            output = f.getvalue()
-            if not silent:
-                stream_content = {'name': 'stdout', 'text': output}
-                self.send_response(self.iopub_socket, 'stream', stream_content)
-        
+            stdout = sys.stdout
+            sys.stdout = stream = _IOPubStream(self, silent)
+            try:
+                self.interp.execute(parse_cell(code))
+            finally:
+                sys.stdout = stdout
+                stream.flush()
+
         except Exception as e:
             error_content = {'name': 'stderr', 'text': str(e)}
             self.send_response(self.iopub_socket, 'stream', error_content)